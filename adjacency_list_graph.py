@@ -30,6 +30,7 @@
 #                                                                       #
 #########################################################################
 
+from numbers import Integral, Real
 from dll_sentinel import DLLSentinel
 from adjacency_matrix_graph import AdjacencyMatrixGraph
 
@@ -72,9 +73,15 @@ class Edge:
 		return string
 
 
+def is_vertex_number(x):
+	"""Return True if x is an integer, or a float with an integral value as held in a
+	float array."""
+	return isinstance(x, Integral) or (isinstance(x, Real) and float(x).is_integer())
+
+
 class AdjacencyListGraph:
 
-	def __init__(self, card_V, directed=True, weighted=False):
+	def __init__(self, card_V, directed=True, weighted=False, indexed=False):
 		"""Initialize a graph implemented by an adjacency list. Vertices are
 		numbered from 0, so that adj_list[i] corresponds to adjacency list of vertex i.
 
@@ -82,6 +89,9 @@ class AdjacencyListGraph:
 		card_V -- number of vertices in this graph
 		directed -- boolean indicating whether the graph is directed
 		weighted -- boolean indicating whether edges are weighted
+		indexed -- boolean indicating whether to keep a hash-based edge index, so that
+		find_edge, has_edge, insert_edge, and delete_edge take O(1) expected time
+		instead of searching an adjacency list
 		"""
 		self.directed = directed
 		self.weighted = weighted
@@ -89,8 +99,78 @@ class AdjacencyListGraph:
 		for i in range(card_V):
 			# Each adjacency list is implemented as a linked list.
 			self.adj_lists[i] = DLLSentinel(get_key_func=Edge.get_v)  # will be a list of Edge objects
+		# edge_index[u] is a dictionary mapping v to the linked-list node holding edge (u, v).
+		if indexed:
+			self.edge_index = [{} for _ in range(card_V)]
+		else:
+			self.edge_index = None
 		self.card_V = card_V
 		self.card_E = 0
+		self.version = 0  # bumped whenever an edge is inserted or deleted
+
+	@classmethod
+	def from_edges(cls, card_V, edges, directed=True, weighted=False, indexed=False, merge_min=False):
+		"""Build a graph from an iterable of edges in one pass.  Instead of raising an
+		error for each bad or repeated edge as insert_edge does, edges are validated
+		and deduplicated in bulk and the rejects are counted.
+
+		Arguments:
+		card_V -- number of vertices in this graph
+		edges -- iterable (list, generator, or 2-D array) of (u, v) pairs, or
+		(u, v, weight) triples if weighted
+		directed -- boolean indicating whether the graph is directed
+		weighted -- boolean indicating whether edges are weighted
+		indexed -- boolean indicating whether to keep a hash-based edge index
+		merge_min -- if True, parallel edges are merged into one edge with the
+		minimum weight; otherwise the first edge given wins.  Ignored for an
+		unweighted graph, where parallel edges are simply dropped.
+
+		Returns:
+		G -- the graph, with edges in the order they first appear
+		skipped -- number of edges rejected: missing or non-integral endpoint, missing
+		or non-numeric weight, endpoint out of range, or self-loop in an undirected graph
+		duplicates -- number of parallel edges dropped or merged
+		"""
+		skipped = 0
+		duplicates = 0
+		weight_by_pair = {}  # dictionaries keep insertion order, so first appearance sets the order
+		for edge in edges:
+			if len(edge) < (3 if weighted else 2):
+				raise RuntimeError("Edge " + str(tuple(edge)) + " should be a "
+								   + ("(u, v, weight) triple." if weighted else "(u, v) pair."))
+			u, v = edge[0], edge[1]
+			weight = edge[2] if weighted else None
+			if not (is_vertex_number(u) and is_vertex_number(v)) \
+					or (weighted and not (isinstance(weight, Real) and weight == weight)):  # NaN != NaN
+				skipped += 1
+				continue
+			u, v = int(u), int(v)
+			if not (0 <= u < card_V and 0 <= v < card_V) or (not directed and u == v):
+				skipped += 1
+				continue
+			# An undirected edge is stored under one key, whichever way round it is given.
+			key = (u, v) if directed or u < v else (v, u)
+			if key in weight_by_pair:
+				duplicates += 1
+				if merge_min and weighted and weight < weight_by_pair[key]:
+					weight_by_pair[key] = weight
+			else:
+				weight_by_pair[key] = weight
+
+		# Every edge is now known to be new and valid, so append without searching.
+		G = cls(card_V, directed, weighted, indexed)
+		adj_lists = G.adj_lists
+		edge_index = G.edge_index
+		for (u, v), weight in weight_by_pair.items():
+			node = adj_lists[u].append(Edge(v, weight))
+			if edge_index is not None:
+				edge_index[u][v] = node
+			if not directed:
+				node = adj_lists[v].append(Edge(u, weight))
+				if edge_index is not None:
+					edge_index[v][u] = node
+		G.card_E = len(weight_by_pair)
+		return G, skipped, duplicates
 
 	def get_card_V(self):
 		"""Return the number of vertices in this graph."""
@@ -116,6 +196,32 @@ class AdjacencyListGraph:
 		"""Return a boolean indicating whether this graph is weighted."""
 		return self.weighted
 
+	def is_indexed(self):
+		"""Return a boolean indicating whether this graph keeps a hash-based edge index."""
+		return self.edge_index is not None
+
+	def get_version(self):
+		"""Return a counter that changes whenever insert_edge or delete_edge changes this
+		graph, so that results computed from the graph can tell when they are out of date.
+		set_edge_weight also changes the counter, but Edge.set_weight does not."""
+		return self.version
+
+	def check_version(self, version, owner):
+		"""Raise an error if this graph changed since get_version returned version.
+
+		Structures that are kept up to date with the graph as it changes, such as
+		DynamicSSSP and DynamicMST, record the version when they are built and after
+		each of their own updates, and call this before the next one.  Once such a
+		structure is built, the graph must be changed only through that structure's
+		delete_edge, insert_edge, and set_edge_weight methods.
+
+		Arguments:
+		version -- the version the structure last saw
+		owner -- name of the structure, for the error message
+		"""
+		if self.version != version:
+			raise RuntimeError("The graph was changed outside " + owner + "; its results are out of date.")
+
 	def insert_edge(self, u, v, weight=None):
 		"""Insert an edge between vertices u and v.
 
@@ -138,19 +244,30 @@ class AdjacencyListGraph:
 		# Cannot insert multiple edges between two vertices.
 		if self.has_edge(u, v):
 			raise RuntimeError("An edge (" + str(u) + ", " + str(v) + ") already exists.")
-		self.adj_lists[u].append(Edge(v, weight))
+		node = self.adj_lists[u].append(Edge(v, weight))
+		if self.edge_index is not None:
+			self.edge_index[u][v] = node
 		self.card_E += 1
+		self.version += 1
 
 		# If this graph is undirected, insert an edge from v to u.
 		if not self.directed:
 			# Cannot insert multiple edges between two vertices.
 			if self.has_edge(v, u):
 				raise RuntimeError("An edge (" + str(v) + ", " + str(u) + ") already exists.")
-			self.adj_lists[v].append(Edge(u, weight))
+			node = self.adj_lists[v].append(Edge(u, weight))
+			if self.edge_index is not None:
+				self.edge_index[v][u] = node
+
+	def find_node(self, u, v):
+		"""Return the linked-list node holding edge (u, v), or None if (u, v) is not in this graph."""
+		if self.edge_index is not None:
+			return self.edge_index[u].get(v)
+		return self.adj_lists[u].search(v)
 
 	def find_edge(self, u, v):
 		"""Return the edge object for edge (u, v) if (u, v) is in this graph, None otherwise."""
-		edge = self.adj_lists[u].search(v)
+		edge = self.find_node(u, v)
 		if edge is None:
 			return None
 		else:
@@ -163,24 +280,52 @@ class AdjacencyListGraph:
 	def delete_edge(self, u, v, delete_undirected=True):
 		"""Delete edge (u, v) if it exists.  No error if it does not exist.
 			Delete both directions if the graph is undirected and delete_undirected is True."""
-		edge = self.adj_lists[u].search(v)
+		edge = self.find_node(u, v)
 		if edge is not None:
 			self.adj_lists[u].delete(edge)
+			if self.edge_index is not None:
+				del self.edge_index[u][v]
 			self.card_E -= 1
+			self.version += 1
 
 		if not self.directed and delete_undirected:
-			edge = self.adj_lists[v].search(u)
+			edge = self.find_node(v, u)
 			if edge is not None:
 				self.adj_lists[v].delete(edge)
+				if self.edge_index is not None:
+					del self.edge_index[v][u]
+				self.version += 1
+
+	def set_edge_weight(self, u, v, weight):
+		"""Change the weight of edge (u, v), in both directions if the graph is undirected."""
+		edge = self.find_edge(u, v)
+		if edge is None:
+			raise RuntimeError("No edge (" + str(u) + ", " + str(v) + ") to reweight.")
+		edge.set_weight(weight)
+		if not self.directed:
+			self.find_edge(v, u).set_weight(weight)
+		self.version += 1
 
 	def copy(self):
 		"""Return a copy of this graph."""
-		copy = AdjacencyListGraph(self.card_V, self.directed, self.weighted)
+		copy = AdjacencyListGraph(self.card_V, self.directed, self.weighted, self.is_indexed())
 		copy.card_E = self.card_E
 		for u in range(self.card_V):
 			copy.adj_lists[u] = self.adj_lists[u].copy()
+			if copy.edge_index is not None:
+				copy.index_adj_list(u)
 		return copy
 
+	def index_adj_list(self, u):
+		"""Rebuild the edge index entries for the adjacency list of vertex u."""
+		index = {}
+		sentinel = self.adj_lists[u].sentinel
+		x = sentinel.next
+		while x is not sentinel:
+			index[x.data.get_v()] = x
+			x = x.next
+		self.edge_index[u] = index
+
 	def get_edge_list(self):
 		"""Return a Python list containing the edges of this graph."""
 		edge_list = []
@@ -194,7 +339,7 @@ class AdjacencyListGraph:
 
 	def transpose(self):
 		"""Return the transpose of this graph."""
-		xpose = AdjacencyListGraph(self.card_V, self.directed, self.weighted)
+		xpose = AdjacencyListGraph(self.card_V, self.directed, self.weighted, self.is_indexed())
 		for u in range(self.card_V):
 			adj_list = self.get_adj_list(u)
 			for edge in adj_list:
@@ -311,3 +456,38 @@ if __name__ == "__main__":
 	# Test transpose.
 	xpose1 = graph1.transpose()
 	print(xpose1)
+
+	# Indexed graph gives the same answers as searching the adjacency lists.
+	graph4 = AdjacencyListGraph(10, directed=False, indexed=True)
+	for i in range(0, len(array1) - 1, 2):
+		try:
+			graph4.insert_edge(array1[i], array1[i + 1])
+		except RuntimeError as e:
+			print(e)
+	print(str(graph4) == str(graph2))
+	graph5 = graph4.copy()
+	graph5.insert_edge(*missing_edge)
+	print(graph5.has_edge(*missing_edge), graph4.has_edge(*missing_edge))
+	graph5.delete_edge(*missing_edge)
+	print(graph5.has_edge(*missing_edge), graph5.has_edge(*(missing_edge[::-1])), graph5.get_card_E())
+	print(all(graph4.has_edge(u, v) == graph2.has_edge(u, v) for u in range(10) for v in range(10)))
+
+	# Bulk loading matches inserting one edge at a time.
+	graph6, skipped, duplicates = AdjacencyListGraph.from_edges(10, array1.reshape(-1, 2), directed=False)
+	print(str(graph6) == str(graph2), graph6.get_card_E() == graph2.get_card_E(), skipped, duplicates)
+	graph7, skipped, duplicates = AdjacencyListGraph.from_edges(3, [(0, 1, 5), (1, 0, 2), (1, 2, 4), (2, 7, 1), (0, 2, None)],
+																directed=False, weighted=True, merge_min=True)
+	print(graph7)
+	print(skipped, duplicates)
+	# Non-numeric weights and fractional endpoints are skipped; integral floats are accepted.
+	graph8, skipped, duplicates = AdjacencyListGraph.from_edges(3, [(0, 1, 'x'), (1.7, 2, 1), (0.0, 2.0, 3),
+																(1, 2, float('nan'))], False, True)
+	print(graph8.get_edge_list(), skipped, duplicates)
+	# merge_min on an unweighted graph just drops the parallel edge.
+	graph9, skipped, duplicates = AdjacencyListGraph.from_edges(3, [(0, 1), (1, 0)], directed=False, merge_min=True)
+	print(graph9.get_edge_list(), skipped, duplicates)
+	try:
+		AdjacencyListGraph.from_edges(3, [(0, 1)], False, True)
+		print("Missing weight column not detected")
+	except RuntimeError as e:
+		print(e)
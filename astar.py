@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# astar.py
+
+from heapq import heappush, heappop
+from math import asin, cos, radians, sin, sqrt
+from single_source_shortest_paths import initialize_single_source, relax
+from dijkstra import path_to
+
+
+def astar(G, s, t, h, settle_func=None):
+	"""Find a shortest path from s to t with A* search: Dijkstra's algorithm with
+	vertices ordered by d[v] + h(v, t) instead of d[v], so that the search heads
+	toward t.  With h always 0 this is the same search as shortest_path.
+
+	Arguments:
+	G -- a directed, weighted graph
+	s -- index of source vertex
+	t -- index of target vertex
+	h -- heuristic function taking a vertex v and the target t and returning a
+	lower bound on the weight of a shortest path from v to t
+	settle_func -- function called upon extracting (expanding) a vertex,
+	taking the vertex as an argument.  Defaults to do nothing.
+	Assumption:
+	All weights are nonnegative and h never overestimates.  If h is also
+	consistent (h(u, t) <= w(u, v) + h(v, t)), each vertex is expanded at most once.
+
+	Returns:
+	dist -- weight of a shortest path from s to t, infinity if t is unreachable
+	path -- list of vertices on a shortest path from s to t, None if t is unreachable
+	"""
+	d, pi = initialize_single_source(G, s)
+
+	# Entries are (d[v] + h(v, t), d[v], v); an entry is stale once d[v] has dropped below it.
+	queue = [(h(s, t), 0, s)]
+	push = lambda v: heappush(queue, (d[v] + h(v, t), d[v], v))
+
+	while queue:
+		f_u, d_u, u = heappop(queue)
+		if d_u > d[u]:  # stale entry
+			continue
+		if settle_func is not None:
+			settle_func(u)
+		if u == t:
+			return d_u, path_to(pi, s, t)
+
+		# Relax each edge; every improvement pushes a new entry.
+		for edge in G.get_adj_list(u):
+			relax(u, edge.get_v(), edge.get_weight(), d, pi, push)
+
+	return float('inf'), None
+
+
+def zero_heuristic(v, t):
+	"""Heuristic that knows nothing; A* with it is Dijkstra's algorithm."""
+	return 0
+
+
+def euclidean_heuristic(points, scale=1):
+	"""Return a heuristic giving the straight-line distance between points, times scale.
+
+	Arguments:
+	points -- list of (x, y) coordinates, indexed by vertex
+	scale -- smallest weight per unit of distance of any edge, so that the
+	heuristic never overestimates
+	"""
+	def h(v, t):
+		dx = points[v][0] - points[t][0]
+		dy = points[v][1] - points[t][1]
+		return scale * sqrt(dx*dx + dy*dy)
+	return h
+
+
+def geographic_heuristic(coordinates, max_speed):
+	"""Return a heuristic giving the great-circle distance between stations divided
+	by the fastest speed on the network, a lower bound on the travel time.
+
+	Arguments:
+	coordinates -- list of (latitude, longitude) pairs in degrees, indexed by vertex
+	max_speed -- fastest speed between any two adjacent stations, in kilometres
+	per unit of edge weight (for example, kilometres per minute)
+	"""
+	def h(v, t):
+		lat1, lon1 = radians(coordinates[v][0]), radians(coordinates[v][1])
+		lat2, lon2 = radians(coordinates[t][0]), radians(coordinates[t][1])
+		a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+		return 2 * 6371.0 * asin(sqrt(a)) / max_speed  # 6371 km is the Earth's mean radius
+	return h
+
+
+# Testing
+if __name__ == "__main__":
+
+	from random import random, randrange, seed
+	from adjacency_list_graph import AdjacencyListGraph
+	from generate_random_graph import textbook_example
+	from dijkstra import dijkstra, shortest_path
+
+	seed(2)
+
+	# Textbook example from dijkstra.py, with no heuristic.
+	vertices, graph1 = textbook_example()
+	dist, path = astar(graph1, vertices.index('s'), vertices.index('x'), zero_heuristic)
+	print("s to x: dist = " + str(dist) + ", path = " + str([vertices[v] for v in path]))
+	print()
+
+	# Random geometric network: stations in the unit square joined to nearby stations,
+	# with travel time equal to distance times a speed factor of at least 1.
+	print("Stations, Queries, Dijkstra expanded, A* expanded")
+	for card_V in [500, 2000, 8000]:
+		points = [(random(), random()) for _ in range(card_V)]
+		cells = {}
+		cell_size = sqrt(8 / card_V)
+		for v in range(card_V):
+			cells.setdefault((int(points[v][0] / cell_size), int(points[v][1] / cell_size)), []).append(v)
+		h = euclidean_heuristic(points)
+		edges = []
+		for u in range(card_V):
+			cx, cy = int(points[u][0] / cell_size), int(points[u][1] / cell_size)
+			for dx in [-1, 0, 1]:
+				for dy in [-1, 0, 1]:
+					for v in cells.get((cx + dx, cy + dy), []):
+						if u < v and h(u, v) < cell_size:
+							edges.append((u, v, h(u, v) * (1 + random())))
+		graph2, skipped, duplicates = AdjacencyListGraph.from_edges(card_V, edges, False, True)
+
+		dijkstra_expanded = []
+		astar_expanded = []
+		for _ in range(50):
+			s, t = randrange(card_V), randrange(card_V)
+			dist1, path1 = shortest_path(graph2, s, t, dijkstra_expanded.append)
+			dist2, path2 = astar(graph2, s, t, h, astar_expanded.append)
+			if dist1 != dist2 and abs(dist1 - dist2) > 1e-9:
+				print("Mismatch for", s, t)
+		d, pi = dijkstra(graph2, 0)
+		for t in range(0, card_V, 97):
+			dist, path = astar(graph2, 0, t, h)
+			if d[t] != dist and abs(d[t] - dist) > 1e-9:
+				print("Mismatch with dijkstra for", 0, t)
+		print(card_V, 50, len(dijkstra_expanded) / 50, len(astar_expanded) / 50, sep=", ")
@@ -32,6 +32,7 @@
 
 from fifo_queue import Queue
 from adjacency_list_graph import AdjacencyListGraph
+from csr_graph import CSRGraph
 from print_path import print_path
 
 WHITE = 0  # undiscovered
@@ -39,13 +40,20 @@ GRAY = 1   # discovered
 BLACK = 2  # visited
 
 
-def bfs(G, source):
+def bfs(G, source, mode="top_down"):
 	"""Perform breadth-first search on a graph, filling in distances and predecessors.
 
 	Arguments:
 	G -- the graph, implemented with adjacency lists
 	source -- index of the source vertex
+	mode -- "top_down" for the search with a queue below, or "direction_optimizing"
+	for bfs_direction_optimizing
 	"""
+	if mode == "direction_optimizing":
+		return bfs_direction_optimizing(G, source)
+	if mode != "top_down":
+		raise RuntimeError("Unknown BFS mode " + str(mode) + ".")
+
 	# Initialize all vertices to white with distance of infinity and no predecessor, except source is gray.
 	card_V = G.get_card_V()  # vertices are numbered, so that color[i] gives the color of vertex i
 	color = [WHITE] * card_V  # all unvisited
@@ -56,6 +64,8 @@ def bfs(G, source):
 
 	q = Queue(card_V)
 	q.enqueue(source)
+	if isinstance(G, CSRGraph):
+		return bfs_csr(G, q, color, dist, pi)
 	while not q.is_empty():
 		u = q.dequeue()
 		for edge in G.get_adj_list(u):  # search the neighbors of u
@@ -69,6 +79,150 @@ def bfs(G, source):
 	return dist, pi
 
 
+def bfs_csr(G, q, color, dist, pi):
+	"""The loop of bfs for a CSRGraph, which hands over each vertex's neighbors as an
+	array slice, so that no Edge object is built per edge."""
+	while not q.is_empty():
+		u = q.dequeue()
+		for v in G.get_neighbors(u):
+			if color[v] == WHITE:
+				color[v] = GRAY
+				dist[v] = dist[u] + 1
+				pi[v] = u
+				q.enqueue(v)
+		color[u] = BLACK
+	return dist, pi
+
+
+def bfs_direction_optimizing(G, source, G_reverse=None, alpha=14, beta=24, step_func=None):
+	"""Breadth-first search that expands each level either top-down, scanning the
+	edges out of the frontier, or bottom-up, scanning the undiscovered vertices
+	for any edge in from the frontier and stopping at the first one found.  When
+	the frontier is large, most undiscovered vertices find a frontier neighbor
+	after a few edges, so bottom-up steps inspect far fewer edges (Beamer,
+	Asanovic, and Patterson).  In a sparse directed graph, though, a vertex has
+	few in-edges to check, so while the frontier is still small a bottom-up step
+	scans most of them without finding a frontier neighbor, and the search can
+	inspect more edges than bfs.  Distances are the same as bfs gives;
+	predecessors form a breadth-first tree but may differ from those of bfs.
+
+	Arguments:
+	G -- the graph.  The search runs on CSR arrays, so an AdjacencyListGraph is
+	converted to a CSRGraph first.
+	source -- index of the source vertex
+	G_reverse -- the transpose of G, whose edges bottom-up steps follow backward.
+	Not needed for an undirected graph, and computed if omitted for a directed graph.
+	alpha -- switch to bottom-up once the edges out of the frontier exceed 1/alpha
+	of the edges out of undiscovered vertices
+	beta -- switch back to top-down once the frontier holds fewer than 1/beta of the vertices
+	step_func -- function called after each level, taking the level number, the
+	direction ("top-down" or "bottom-up"), the frontier size, and the number of
+	edges inspected.  Defaults to do nothing.
+
+	Returns:
+	dist -- distances from the source
+	pi -- predecessors
+	"""
+	if not isinstance(G, CSRGraph):
+		G = CSRGraph.from_adjacency_list_graph(G)
+	if G_reverse is None:
+		G_reverse = G if not G.is_directed() else G.transpose()
+	elif not isinstance(G_reverse, CSRGraph):
+		G_reverse = CSRGraph.from_adjacency_list_graph(G_reverse)
+
+	card_V = G.get_card_V()
+	offsets, targets = G.offsets, G.targets
+	reverse_offsets, reverse_targets = G_reverse.offsets, G_reverse.targets
+	dist = [float('inf')] * card_V
+	pi = [None] * card_V
+	dist[source] = 0
+
+	frontier = [source]
+	unvisited = [v for v in range(card_V) if v != source]
+	unexplored_edges = len(targets) - (offsets[source + 1] - offsets[source])
+	top_down = True
+	level = 0
+	while len(frontier) > 0:
+		frontier_edges = sum(offsets[u + 1] - offsets[u] for u in frontier)
+		if top_down and frontier_edges > unexplored_edges / alpha:
+			top_down = False
+		elif not top_down and len(frontier) < card_V / beta:
+			top_down = True
+
+		next_frontier = []
+		if top_down:
+			inspected = frontier_edges
+			for u in frontier:
+				for v in targets[offsets[u]:offsets[u + 1]]:
+					if pi[v] is None and v != source:  # is v being discovered now?
+						dist[v] = level + 1
+						pi[v] = u
+						next_frontier.append(v)
+		else:
+			inspected = 0
+			in_frontier = bytearray(card_V)
+			for u in frontier:
+				in_frontier[u] = 1
+			unvisited = [v for v in unvisited if pi[v] is None]
+			for v in unvisited:
+				for u in reverse_targets[reverse_offsets[v]:reverse_offsets[v + 1]]:
+					inspected += 1
+					if in_frontier[u]:  # the first frontier neighbor found becomes the parent
+						dist[v] = level + 1
+						pi[v] = u
+						next_frontier.append(v)
+						break
+
+		if step_func is not None:
+			step_func(level, "top-down" if top_down else "bottom-up", len(frontier), inspected)
+		unexplored_edges -= sum(offsets[v + 1] - offsets[v] for v in next_frontier)
+		frontier = next_frontier
+		level += 1
+
+	return dist, pi
+
+
+def multi_source_bfs(G, sources):
+	"""Perform breadth-first search from several sources at once, all starting at
+	distance 0, so that each vertex gets its distance from the nearest source.
+
+	Arguments:
+	G -- the graph, implemented with adjacency lists
+	sources -- nonempty list of indices of source vertices
+
+	Returns:
+	dist -- distances from the nearest source
+	pi -- predecessors, None for the sources and unreachable vertices
+	nearest -- nearest[v] is the source that v is closest to, None if v is unreachable
+	"""
+	if len(sources) == 0:
+		raise RuntimeError("Multi-source search needs at least one source.")
+	card_V = G.get_card_V()
+	color = [WHITE] * card_V
+	dist = [float('inf')] * card_V
+	pi = [None] * card_V
+	nearest = [None] * card_V
+
+	q = Queue(card_V + 1)  # room for every vertex at once, if every vertex is a source
+	for s in sources:
+		if color[s] == WHITE:
+			color[s] = GRAY
+			dist[s] = 0
+			nearest[s] = s
+			q.enqueue(s)
+	while not q.is_empty():
+		u = q.dequeue()
+		for edge in G.get_adj_list(u):  # search the neighbors of u
+			v = edge.get_v()
+			if color[v] == WHITE:  # is v being discovered now?
+				color[v] = GRAY
+				dist[v] = dist[u] + 1
+				pi[v] = u
+				nearest[v] = nearest[u]  # v is nearest to the same source as u
+				q.enqueue(v)
+		color[u] = BLACK
+	return dist, pi, nearest
+
 # Testing
 if __name__ == "__main__":
 
@@ -101,3 +255,39 @@ if __name__ == "__main__":
 	for i in range(card_V):
 		print(vertices[i] + ": dist = " + str(dist[i]) + ", path = " + \
 				str(print_path(predecessor, s, i, lambda i: vertices[i])))
+	print()
+
+	# Multi-source search: each vertex is as far as its nearest source.
+	sources = [vertices.index('r'), vertices.index('y')]
+	dist, predecessor, nearest = multi_source_bfs(graph2, sources)
+	for i in range(card_V):
+		print(vertices[i] + ": dist = " + str(dist[i]) + ", nearest source = " + vertices[nearest[i]])
+	single = [bfs(graph2, s)[0] for s in sources]
+	print("Multi-source distances " + ("agree" if dist == [min(d[i] for d in single) for i in range(card_V)]
+									   else "disagree") + " with single-source bfs")
+	print()
+
+	# Direction-optimizing search gives the same distances.  It inspects fewer edges on
+	# the undirected graphs, but can inspect more on the sparser directed ones.
+	from random import randrange, seed
+	seed(17)
+	print("Vertices, Directed, Top-down edges, Direction-optimizing edges, Levels bottom-up, Fewer edges")
+	for card_V, degree in [(2000, 10), (20000, 16)]:
+		for directed in [False, True]:
+			edges = [(randrange(card_V), randrange(card_V)) for _ in range(card_V * degree // 2)]
+			edges = {(u, v) if directed or u < v else (v, u): None for (u, v) in edges if u != v}  # no parallel edges
+			graph3 = CSRGraph.from_edges(card_V, list(edges), directed)
+			graph3_reverse = graph3.transpose() if directed else None
+			dist, predecessor = bfs(graph3, 0)
+			steps = []
+			fast_dist, fast_predecessor = bfs_direction_optimizing(graph3, 0, graph3_reverse,
+																   step_func=lambda *step: steps.append(step))
+			valid = fast_dist == dist and all(fast_predecessor[v] is None or
+											  dist[fast_predecessor[v]] == dist[v] - 1 and graph3.has_edge(fast_predecessor[v], v)
+											  for v in range(card_V))
+			top_down_edges = sum(graph3.get_degree(u) for u in range(card_V) if dist[u] != float('inf'))
+			direction_optimizing_edges = sum(step[3] for step in steps)
+			print(card_V, directed, top_down_edges, direction_optimizing_edges,
+				  sum(1 for step in steps if step[1] == "bottom-up"),
+				  "yes" if direction_optimizing_edges < top_down_edges else "no",
+				  "valid" if valid else "INVALID", sep=", ")
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# biconnected_components.py
+
+"""Bridges, articulation points, and biconnected components of an undirected graph.
+
+Tarjan's low-link method: in a depth-first search, low[u] is the earliest
+discovery time reachable from u's subtree using tree edges down and at most one
+back edge up.  If low[v] >= d[u] for a child v of u, then every path out of v's
+subtree passes through u, so u is an articulation point (the root only if it
+has two or more children) and the edges found since (u, v) form a biconnected
+component.  If low[v] > d[u], not even another way round to u exists, and (u, v)
+is a bridge.  One search finds everything in O(V + E) time."""
+
+
+def biconnected_components(G):
+	"""Find the bridges, articulation points, and biconnected components of G.
+
+	Arguments:
+	G -- an undirected graph, represented by adjacency lists
+
+	Returns:
+	bridges -- list of (u, v) edges, with u < v, whose removal disconnects the graph
+	articulation_points -- sorted list of vertices whose removal disconnects the graph
+	components -- list of biconnected components, each a list of (u, v) edges.
+	Every edge is in exactly one component; a bridge is a component by itself.
+	"""
+	if G.is_directed():
+		raise RuntimeError("Biconnected components are defined for undirected graphs.")
+
+	card_V = G.get_card_V()
+	d = [None] * card_V  # discovery times
+	low = [None] * card_V
+	time = 0
+	bridges = []
+	is_articulation = [False] * card_V
+	components = []
+	edge_stack = []  # edges of the components not yet complete
+
+	for root in range(card_V):
+		if d[root] is not None:
+			continue
+		time += 1
+		d[root] = low[root] = time
+		root_children = 0
+		# The explicit stack holds (vertex, its parent, iterator over its adjacency list).
+		stack = [(root, None, iter(G.get_adj_list(root)))]
+		while len(stack) > 0:
+			u, parent, edges = stack[-1]
+			descended = False
+			for edge in edges:
+				v = edge.get_v()
+				if d[v] is None:  # tree edge: search from v before going on with u
+					edge_stack.append((u, v))
+					time += 1
+					d[v] = low[v] = time
+					if u == root:
+						root_children += 1
+					stack.append((v, u, iter(G.get_adj_list(v))))
+					descended = True
+					break
+				if v != parent and d[v] < d[u]:  # back edge to an ancestor
+					edge_stack.append((u, v))
+					if d[v] < low[u]:
+						low[u] = d[v]
+			if descended:
+				continue
+
+			# Every edge leaving u has been explored; report to the parent.
+			stack.pop()
+			if parent is None:
+				continue
+			if low[u] < low[parent]:
+				low[parent] = low[u]
+			if low[u] >= d[parent]:
+				# Nothing in u's subtree reaches above parent: the edges since (parent, u) form a component.
+				if parent != root:
+					is_articulation[parent] = True
+				component = []
+				while True:
+					edge = edge_stack.pop()
+					component.append(edge)
+					if edge == (parent, u):
+						break
+				components.append(component)
+				if low[u] > d[parent]:
+					bridges.append((min(parent, u), max(parent, u)))
+		if root_children >= 2:
+			is_articulation[root] = True
+
+	articulation_points = [v for v in range(card_V) if is_articulation[v]]
+	return bridges, articulation_points, components
+
+
+# Testing
+if __name__ == "__main__":
+
+	import time
+	from random import seed
+	from adjacency_list_graph import AdjacencyListGraph
+	from generate_random_graph import generate_random_graph
+
+	seed(20)
+
+	def count_components(G, removed_vertex=None):
+		"""Count connected components, ignoring one vertex if given."""
+		seen = [False] * G.get_card_V()
+		count = 0
+		for s in range(G.get_card_V()):
+			if s != removed_vertex and not seen[s]:
+				count += 1
+				stack = [s]
+				seen[s] = True
+				while stack:
+					u = stack.pop()
+					for edge in G.get_adj_list(u):
+						v = edge.get_v()
+						if v != removed_vertex and not seen[v]:
+							seen[v] = True
+							stack.append(v)
+		return count
+
+	# Textbook-style example: two triangles joined through vertex 2, with a pendant edge.
+	graph1 = AdjacencyListGraph(6, False)
+	for (u, v) in [(0, 1), (1, 2), (2, 0), (2, 3), (3, 4), (4, 2), (4, 5)]:
+		graph1.insert_edge(u, v)
+	bridges, articulation_points, components = biconnected_components(graph1)
+	print("Bridges:", bridges)
+	print("Articulation points:", articulation_points)
+	print("Components:", components)
+	print()
+
+	# Compare with removing each edge and each vertex in turn.
+	all_equal = True
+	for trial in range(20):
+		graph2 = generate_random_graph(40, 0.06, True, False)
+		bridges, articulation_points, components = biconnected_components(graph2)
+		base = count_components(graph2)
+		expected_bridges = []
+		for (u, v) in graph2.get_edge_list():
+			graph2.delete_edge(u, v)
+			if count_components(graph2) > base:
+				expected_bridges.append((u, v))
+			graph2.insert_edge(u, v)
+		expected_points = [v for v in range(40) if count_components(graph2, v) > base]
+		edges_covered = sorted(tuple(sorted(edge)) for component in components for edge in component)
+		if sorted(bridges) != sorted(expected_bridges) or articulation_points != expected_points \
+				or edges_covered != sorted(graph2.get_edge_list()):
+			all_equal = False
+	print("Bridges, articulation points, and components are " + ("not " if not all_equal else "")
+		  + "equal to brute force")
+
+	# A long line-like network, far deeper than the recursion limit.
+	card_V = 200000
+	edges = [(v, v + 1) for v in range(card_V - 1)] + [(v, v + 2) for v in range(0, card_V // 2, 2)]
+	graph3, skipped, duplicates = AdjacencyListGraph.from_edges(card_V, edges, False)
+	start = time.perf_counter()
+	bridges, articulation_points, components = biconnected_components(graph3)
+	print(card_V, "stations:", len(bridges), "bridges,", len(articulation_points), "articulation points,",
+		  len(components), "components in", round(time.perf_counter() - start, 3), "s")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# bidirectional_dijkstra.py
+
+from indexed_min_heap import IndexedMinHeap
+from single_source_shortest_paths import initialize_single_source
+from dijkstra import path_to
+
+
+def bidirectional_dijkstra(G, s, t, G_reverse=None, settle_func=None):
+	"""Find a shortest path from s to t by running Dijkstra's algorithm forward from s
+	and backward from t at the same time, until the two searches meet.
+
+	Arguments:
+	G -- a weighted graph
+	s -- index of source vertex
+	t -- index of target vertex
+	G_reverse -- the transpose of G, searched by the backward search.  Not needed
+	for an undirected graph, and computed if omitted for a directed graph.
+	settle_func -- function called upon extracting a vertex from either priority
+	queue, taking the vertex as an argument.  Defaults to do nothing.
+	Assumption:
+	All weights are nonnegative
+
+	Returns:
+	dist -- weight of a shortest path from s to t, infinity if t is unreachable
+	path -- list of vertices on a shortest path from s to t, None if t is unreachable
+	"""
+	if G_reverse is None:
+		G_reverse = G if not G.is_directed() else G.transpose()
+
+	card_V = G.get_card_V()
+	d_forward, pi_forward = initialize_single_source(G, s)
+	d_backward, pi_backward = initialize_single_source(G_reverse, t)
+	queue_forward = IndexedMinHeap(card_V)
+	queue_forward.insert(s, 0)
+	queue_backward = IndexedMinHeap(card_V)
+	queue_backward.insert(t, 0)
+	settled_forward = [False] * card_V
+	settled_backward = [False] * card_V
+
+	best = 0 if s == t else float('inf')  # weight of the best s-t path seen so far
+	meet = s if s == t else None          # vertex where that path crosses between the searches
+
+	while queue_forward.get_size() > 0 and queue_backward.get_size() > 0:
+		# No path through an unsettled vertex can beat best once the two tops add up to it.
+		if queue_forward.get_key(queue_forward.minimum()) + \
+				queue_backward.get_key(queue_backward.minimum()) >= best:
+			break
+
+		# Advance the search whose frontier is closer to its start.
+		if queue_forward.get_key(queue_forward.minimum()) <= queue_backward.get_key(queue_backward.minimum()):
+			graph, queue, d, pi, settled = G, queue_forward, d_forward, pi_forward, settled_forward
+			d_other = d_backward
+		else:
+			graph, queue, d, pi, settled = G_reverse, queue_backward, d_backward, pi_backward, settled_backward
+			d_other = d_forward
+
+		u = queue.extract_min()
+		settled[u] = True
+		if settle_func is not None:
+			settle_func(u)
+
+		for edge in graph.get_adj_list(u):
+			v = edge.get_v()
+			d_v = d[u] + edge.get_weight()
+			if d[v] > d_v:
+				d[v] = d_v
+				pi[v] = u
+				if queue.contains(v):
+					queue.decrease_key(v, d_v)
+				elif not settled[v]:
+					queue.insert(v, d_v)
+				# Vertex v joins the two searches if the other one has reached it.
+				if d_v + d_other[v] < best:
+					best = d_v + d_other[v]
+					meet = v
+
+	if meet is None:
+		return float('inf'), None
+
+	# Forward predecessors lead from meet back to s, backward predecessors from meet on to t.
+	path = path_to(pi_forward, s, meet)
+	v = meet
+	while v != t:
+		v = pi_backward[v]
+		path.append(v)
+	return best, path
+
+
+# Testing
+if __name__ == "__main__":
+
+	from random import randrange, seed
+	from bellman_ford import bellman_ford
+	from generate_random_graph import generate_random_graph, generate_random_network, path_weight, textbook_example
+	from dijkstra import dijkstra, shortest_path
+
+	seed(1)
+
+	# Textbook example.
+	vertices, graph1 = textbook_example()
+	dist, path = bidirectional_dijkstra(graph1, vertices.index('s'), vertices.index('x'))
+	print("s to x: dist = " + str(dist) + ", path = " + str([vertices[v] for v in path]))
+	print()
+
+	# Distances should all equal those from dijkstra and bellman_ford, directed and undirected.
+	card_V = 100
+	for directed in [True, False]:
+		graph2 = generate_random_graph(card_V, 0.05, True, directed, True, 0, 15)
+		graph2_reverse = graph2.transpose() if directed else None
+		all_equal = True
+		for s in range(card_V):
+			dijkstra_d, dijkstra_pi = dijkstra(graph2, s)
+			bf_d, bf_pi, cycle = bellman_ford(graph2, s)
+			for t in range(card_V):
+				dist, path = bidirectional_dijkstra(graph2, s, t, graph2_reverse)
+				if dist != dijkstra_d[t] or dist != bf_d[t] or \
+						(path is not None and (path[0] != s or path[-1] != t or path_weight(graph2, path) != dist)):
+					print("Mismatch for", s, t, "directed" if directed else "undirected")
+					all_equal = False
+		print(("Directed" if directed else "Undirected") + " bidirectional distances are "
+			  + ("not " if not all_equal else "") + "equal")
+	print()
+
+	# Settled-vertex counts against one-directional early-exit search.
+	print("Vertices, Queries, Unidirectional settled, Bidirectional settled")
+	for card_V in [1000, 4000, 16000]:
+		# Random spanning tree plus extra random edges, as in task2b.py.
+		graph3 = generate_random_network(card_V, 2 * card_V)
+		one_way = []
+		two_way = []
+		for _ in range(50):
+			s, t = randrange(card_V), randrange(card_V)
+			dist1, path1 = shortest_path(graph3, s, t, one_way.append)
+			dist2, path2 = bidirectional_dijkstra(graph3, s, t, settle_func=two_way.append)
+			if dist1 != dist2:
+				print("Mismatch for", s, t)
+		print(card_V, 50, len(one_way) / 50, len(two_way) / 50, sep=", ")
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# closure_impact.py
+
+"""Batch what-if analysis of closing connections.
+
+For each candidate edge, the impact of closing it is the total increase in
+shortest-path distance over a set of (source, target) journeys, together with
+the number of journeys made longer and the number cut off altogether.  Each
+source keeps one DynamicSSSP; closing an edge repairs only the subtree that
+hangs below it, the changed distances are read off, and reopening the edge
+restores the tree for the next candidate.  Sources are split among a pool of
+worker processes, each of which rebuilds the graph once from its edge list."""
+
+import csv
+import os
+from multiprocessing import Pool
+from random import Random
+from adjacency_list_graph import AdjacencyListGraph
+from dynamic_sssp import DynamicSSSP
+
+INF = float('inf')
+
+# Graph rebuilt in each worker process by init_worker.
+worker_graph = None
+
+
+class ClosureImpact:
+
+	def __init__(self, u, v, weight, affected, disconnected, increase):
+		"""Impact of closing edge (u, v).
+
+		Arguments:
+		u, v -- endpoints of the edge
+		weight -- its weight
+		affected -- number of journeys that became longer but stayed possible
+		disconnected -- number of journeys that became impossible
+		increase -- total increase in distance over the affected journeys
+		"""
+		self.u = u
+		self.v = v
+		self.weight = weight
+		self.affected = affected
+		self.disconnected = disconnected
+		self.increase = increase
+
+	def mean_increase(self):
+		"""Return the average increase over the affected journeys, 0 if there are none."""
+		return self.increase / self.affected if self.affected > 0 else 0
+
+	def __str__(self):
+		return "(" + str(self.u) + ", " + str(self.v) + "): " + str(self.affected) + " longer, " \
+			+ str(self.disconnected) + " cut off, total increase " + str(self.increase)
+
+
+def closure_impacts(G, candidates=None, sources=None, sample=None, processes=None, seed=0):
+	"""Compute the impact of closing each candidate edge of G, one at a time.
+
+	Arguments:
+	G -- a weighted AdjacencyListGraph with nonnegative weights
+	candidates -- list of (u, v) edges to try closing, or None for every edge
+	sources -- list of journey origins, or None for all vertices.  Every vertex
+	is a journey destination.
+	sample -- if given and sources is None, use this many randomly chosen origins
+	processes -- number of worker processes, None for one per CPU.  With 1,
+	everything runs in this process.
+	seed -- seed for choosing the sample
+
+	Returns:
+	A list of ClosureImpact objects, most disruptive first: by journeys cut off,
+	then by total increase.
+	"""
+	card_V = G.get_card_V()
+	if candidates is None:
+		candidates = G.get_edge_list()
+	if sources is None:
+		sources = list(range(card_V))
+		if sample is not None and sample < card_V:
+			sources = sorted(Random(seed).sample(sources, sample))
+	if processes is None:
+		processes = os.cpu_count() or 1
+	processes = max(1, min(processes, len(sources)))
+
+	weights = [G.find_edge(u, v).get_weight() for (u, v) in candidates]
+	edges = [(u, edge.get_v(), edge.get_weight()) for u in range(card_V) for edge in G.get_adj_list(u)
+			 if G.is_directed() or u < edge.get_v()]
+	graph_spec = (card_V, G.is_directed(), edges)
+	chunks = [sources[i::processes] for i in range(processes)]
+
+	if processes == 1:
+		init_worker(graph_spec)
+		results = [impacts_from_sources(chunks[0], candidates, weights)]
+	else:
+		with Pool(processes, initializer=init_worker, initargs=(graph_spec,)) as pool:
+			results = pool.starmap(impacts_from_sources, [(chunk, candidates, weights) for chunk in chunks])
+
+	# Add up the counts from each worker, edge by edge.
+	impacts = []
+	for i, (u, v) in enumerate(candidates):
+		affected = sum(result[i][0] for result in results)
+		disconnected = sum(result[i][1] for result in results)
+		increase = sum(result[i][2] for result in results)
+		impacts.append(ClosureImpact(u, v, weights[i], affected, disconnected, increase))
+	impacts.sort(key=lambda impact: (-impact.disconnected, -impact.increase, impact.u, impact.v))
+	return impacts
+
+
+def init_worker(graph_spec):
+	"""Rebuild the graph from (card_V, directed, edges) in this process."""
+	global worker_graph
+	card_V, directed, edges = graph_spec
+	worker_graph, skipped, duplicates = AdjacencyListGraph.from_edges(card_V, edges, directed, True, indexed=True)
+
+
+def impacts_from_sources(sources, candidates, weights):
+	"""Return a list with [affected, disconnected, increase] for each candidate edge,
+	counting the journeys from the given sources."""
+	totals = [[0, 0, 0] for _ in candidates]
+	for s in sources:
+		sssp = DynamicSSSP(worker_graph, s)
+		d = sssp.get_distances()
+		for i, (u, v) in enumerate(candidates):
+			# Close the edge, note the new distances, and reopen it to restore the old ones.
+			changed = sssp.delete_edge(u, v)
+			closed_d = [(x, d[x]) for x in changed]
+			sssp.insert_edge(u, v, weights[i])
+			for x, closed in closed_d:
+				if closed == INF:
+					totals[i][1] += 1
+				else:
+					totals[i][0] += 1
+					totals[i][2] += closed - d[x]
+	return totals
+
+
+def write_impacts_csv(path, impacts, name_by_id=None):
+	"""Write closure impacts to a CSV file in ranked order, with station names if
+	name_by_id is given."""
+	with open(path, 'w', newline='') as f:
+		writer = csv.writer(f)
+		header = ["rank", "u", "v"]
+		if name_by_id is not None:
+			header += ["from", "to"]
+		writer.writerow(header + ["weight", "journeys_longer", "journeys_cut_off",
+								  "total_increase", "mean_increase"])
+		for rank, impact in enumerate(impacts, 1):
+			row = [rank, impact.u, impact.v]
+			if name_by_id is not None:
+				row += [name_by_id[impact.u], name_by_id[impact.v]]
+			writer.writerow(row + [impact.weight, impact.affected, impact.disconnected,
+								   impact.increase, round(impact.mean_increase(), 4)])
+
+
+# Testing
+if __name__ == "__main__":
+
+	import tempfile
+	import time
+	from random import randrange, seed
+	from generate_random_graph import generate_random_network
+	from dijkstra import dijkstra
+
+	seed(14)
+
+	# Brute force: close each edge and rerun dijkstra from every source.
+	def brute_force(G, candidates, sources):
+		before = [dijkstra(G, s)[0] for s in sources]
+		totals = {}
+		for (u, v) in candidates:
+			weight = G.find_edge(u, v).get_weight()
+			G.delete_edge(u, v)
+			affected, disconnected, increase = 0, 0, 0
+			for i, s in enumerate(sources):
+				d, pi = dijkstra(G, s)
+				for x in range(G.get_card_V()):
+					if d[x] == INF and before[i][x] != INF:
+						disconnected += 1
+					elif d[x] != before[i][x]:
+						affected += 1
+						increase += d[x] - before[i][x]
+			G.insert_edge(u, v, weight)
+			totals[(u, v)] = (affected, disconnected, increase)
+		return totals
+
+	for directed in [True, False]:
+		card_V = 60
+		graph1 = generate_random_network(card_V, card_V, directed, indexed=True)
+		expected = brute_force(graph1, graph1.get_edge_list(), list(range(card_V)))
+		for processes in [1, 2]:
+			impacts = closure_impacts(graph1, processes=processes)
+			found = {(i.u, i.v): (i.affected, i.disconnected, i.increase) for i in impacts}
+			print(("Directed" if directed else "Undirected"), processes, "process(es): impacts "
+				  + ("agree" if found == expected else "disagree") + " with brute force")
+	print("Most disruptive closure:", impacts[0])
+
+	path = os.path.join(tempfile.mkdtemp(), "impacts.csv")
+	write_impacts_csv(path, impacts)
+	with open(path) as f:
+		print("CSV rows:", sum(1 for _ in f) - 1, "of", len(impacts))
+	print()
+
+	# Sampled journeys on a larger network.
+	card_V = 3000
+	graph2 = generate_random_network(card_V, card_V // 2, indexed=True)
+	candidates = graph2.get_edge_list()[:300]
+	start = time.perf_counter()
+	impacts = closure_impacts(graph2, candidates, sample=100)
+	print(len(candidates), "closures x 100 sampled origins on", card_V, "stations:",
+		  round(time.perf_counter() - start, 2), "s")
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# contraction_hierarchy.py
+
+"""Contraction hierarchies for repeated shortest-path queries on a static graph.
+
+Preprocessing contracts the vertices one at a time in order of importance.
+Contracting v removes it from the remaining graph and, for each pair of
+neighbors u and w whose only shortest path runs through v, adds a shortcut
+edge (u, w) remembering v as its middle vertex.  A query then runs a
+bidirectional Dijkstra search that only follows edges toward more important
+vertices, which settles a small number of vertices, and unpacks shortcuts to
+recover the path in the original graph."""
+
+from heapq import heapify, heappush, heappop
+
+INF = float('inf')
+
+
+class ContractionHierarchy:
+
+	def __init__(self, G, witness_limit=60, core_degree=None):
+		"""Contract the vertices of G and build the upward and downward search graphs.
+
+		Arguments:
+		G -- a weighted graph with nonnegative weights, directed or undirected
+		witness_limit -- maximum number of vertices settled by each witness search.
+		A smaller limit preprocesses faster but may add unneeded shortcuts; query
+		results are exact either way.
+		core_degree -- if given, a vertex with more than this many neighbors is set
+		aside rather than contracted, and contracting goes on with the others.  A
+		vertex set aside is considered again whenever one of its neighbors is
+		contracted, and those still left at the end form a core that queries search
+		with plain bidirectional Dijkstra.  Graphs without much hierarchy, such as
+		uniformly random graphs, otherwise end in a dense core whose contraction
+		dominates preprocessing time.
+		"""
+		card_V = G.get_card_V()
+		self.card_V = card_V
+		self.directed = G.is_directed()
+		self.witness_limit = witness_limit
+		self.core_degree = core_degree
+
+		# middle[(u, w)] is the vertex that shortcut (u, w) bypasses.
+		self.middle = {}
+
+		# Remaining graph as dictionaries mapping neighbor to weight.  For an undirected
+		# graph, in_edges and out_edges are the same lists of dictionaries.
+		self.out_edges = [{} for _ in range(card_V)]
+		self.in_edges = [{} for _ in range(card_V)] if self.directed else self.out_edges
+		for u in range(card_V):
+			for edge in G.get_adj_list(u):
+				v = edge.get_v()
+				if u != v:
+					self.add_edge(u, v, edge.get_weight(), None)
+
+		self.rank = [None] * card_V
+		self.up = [None] * card_V    # up[u]: list of (w, weight) for edges (u, w) to higher-ranked w
+		self.down = [None] * card_V  # down[w]: list of (u, weight) for edges (u, w) from higher-ranked u
+		self.shortcut_count = 0
+		self.core_size = 0
+		self.contract_all()
+
+		# The remaining-graph dictionaries are empty or copied into up and down now.
+		self.out_edges = None
+		self.in_edges = None
+
+	def add_edge(self, u, w, weight, mid):
+		"""Add edge (u, w) to the remaining graph unless an edge at least as light is there.
+		mid is the bypassed vertex for a shortcut, None for an original edge."""
+		if weight >= self.out_edges[u].get(w, INF):
+			return
+		self.out_edges[u][w] = weight
+		self.in_edges[w][u] = weight
+		if not self.directed:
+			self.out_edges[w][u] = weight
+		for key in [(u, w)] if self.directed else [(u, w), (w, u)]:
+			if mid is None:
+				self.middle.pop(key, None)
+			else:
+				self.middle[key] = mid
+
+	def witness_search(self, u, v, limit):
+		"""Return distances from u in the remaining graph without v, exploring no
+		farther than limit and settling at most witness_limit vertices."""
+		d = {u: 0}
+		queue = [(0, u)]
+		settled = 0
+		while queue and settled < self.witness_limit:
+			d_x, x = heappop(queue)
+			if d_x > d[x]:
+				continue
+			if d_x > limit:
+				break
+			settled += 1
+			for y, weight in self.out_edges[x].items():
+				if y == v:
+					continue
+				d_y = d_x + weight
+				if d_y < d.get(y, INF):
+					d[y] = d_y
+					heappush(queue, (d_y, y))
+		return d
+
+	def needed_shortcuts(self, v):
+		"""Return the list of (u, w, weight) shortcuts needed to contract v now."""
+		shortcuts = []
+		out_v = self.out_edges[v]
+		if len(out_v) == 0:
+			return shortcuts
+		max_out = max(out_v.values())
+		for u, weight_uv in self.in_edges[v].items():
+			d = self.witness_search(u, v, weight_uv + max_out)
+			for w, weight_vw in out_v.items():
+				# An undirected pair is handled once, from its smaller end.
+				if w == u or (not self.directed and w < u):
+					continue
+				if d.get(w, INF) > weight_uv + weight_vw:
+					shortcuts.append((u, w, weight_uv + weight_vw))
+		return shortcuts
+
+	def priority(self, v, contracted_neighbors):
+		"""Return the contraction priority of v: the edge difference (shortcuts added
+		minus edges removed) plus the number of neighbors already contracted."""
+		shortcuts = len(self.needed_shortcuts(v))
+		removed = len(self.out_edges[v]) + (len(self.in_edges[v]) if self.directed else 0)
+		if not self.directed:
+			shortcuts *= 2
+			removed *= 2
+		return shortcuts - removed + contracted_neighbors[v]
+
+	def contract_all(self):
+		"""Order the vertices by priority and contract them in that order.  A vertex's
+		priority depends only on its neighborhood, which changes only when one of its
+		neighbors is contracted, so it is recomputed then and stays current."""
+		contracted_neighbors = [0] * self.card_V
+		current_priority = [self.priority(v, contracted_neighbors) for v in range(self.card_V)]
+		queue = [(current_priority[v], v) for v in range(self.card_V)]
+		heapify(queue)
+		next_rank = 0
+		while queue:
+			p, v = heappop(queue)
+			if self.rank[v] is not None or p != current_priority[v]:  # stale entry
+				continue
+			if self.core_degree is not None and len(self.out_edges[v]) > self.core_degree:
+				continue  # set aside until a neighbor's contraction pushes it again
+
+			self.rank[v] = next_rank
+			next_rank += 1
+			for u, w, weight in self.needed_shortcuts(v):
+				self.add_edge(u, w, weight, v)
+				self.shortcut_count += 1
+
+			# Every remaining neighbor outranks v, so v's edges go into the search graphs.
+			self.up[v] = list(self.out_edges[v].items())
+			self.down[v] = list(self.in_edges[v].items())
+			neighbors = set(self.in_edges[v]) | set(self.out_edges[v])
+			for u in self.in_edges[v]:
+				del self.out_edges[u][v]
+			for w in self.out_edges[v]:
+				self.in_edges[w].pop(v, None)
+			self.out_edges[v] = {}
+			self.in_edges[v] = {}
+			for x in neighbors:
+				contracted_neighbors[x] += 1
+				current_priority[x] = self.priority(x, contracted_neighbors)
+				heappush(queue, (current_priority[x], x))
+
+		# Core vertices share the top rank, and both searches may use every core edge.
+		for v in range(self.card_V):
+			if self.rank[v] is None:
+				self.rank[v] = next_rank
+				self.up[v] = list(self.out_edges[v].items())
+				self.down[v] = list(self.in_edges[v].items())
+				self.core_size += 1
+
+	def get_core_size(self):
+		"""Return the number of vertices left uncontracted in the core."""
+		return self.core_size
+
+	def get_shortcut_count(self):
+		"""Return the number of shortcuts added during preprocessing."""
+		return self.shortcut_count
+
+	def query(self, s, t, settle_func=None):
+		"""Find a shortest path from s to t.
+
+		Arguments:
+		s -- index of source vertex
+		t -- index of target vertex
+		settle_func -- function called upon settling a vertex in either search,
+		taking the vertex as an argument.  Defaults to do nothing.
+
+		Returns:
+		dist -- weight of a shortest path from s to t, infinity if t is unreachable
+		path -- list of vertices on a shortest path from s to t in the original
+		graph, None if t is unreachable
+		"""
+		d_forward = {s: 0}
+		d_backward = {t: 0}
+		pi_forward = {s: None}
+		pi_backward = {t: None}
+		queue_forward = [(0, s)]
+		queue_backward = [(0, t)]
+		best = INF
+		meet = None
+
+		while queue_forward or queue_backward:
+			# Advance the search whose frontier is closer to its start.
+			if queue_forward and (not queue_backward or queue_forward[0][0] <= queue_backward[0][0]):
+				queue, d, pi, d_other, edges = queue_forward, d_forward, pi_forward, d_backward, self.up
+			else:
+				queue, d, pi, d_other, edges = queue_backward, d_backward, pi_backward, d_forward, self.down
+			d_u, u = heappop(queue)
+			if d_u > d[u]:  # stale entry
+				continue
+			if d_u >= best:
+				# Nothing left in this direction can improve on best.
+				del queue[:]
+				continue
+			if settle_func is not None:
+				settle_func(u)
+			if u in d_other and d_u + d_other[u] < best:
+				best = d_u + d_other[u]
+				meet = u
+			for v, weight in edges[u]:
+				d_v = d_u + weight
+				if d_v < d.get(v, INF):
+					d[v] = d_v
+					pi[v] = u
+					heappush(queue, (d_v, v))
+
+		if meet is None:
+			return INF, None
+
+		# Walk from meet back to s and on to t, then expand the shortcuts.
+		hierarchy_path = [meet]
+		v = meet
+		while pi_forward[v] is not None:
+			v = pi_forward[v]
+			hierarchy_path.append(v)
+		hierarchy_path.reverse()
+		v = meet
+		while pi_backward[v] is not None:
+			v = pi_backward[v]
+			hierarchy_path.append(v)
+
+		path = [s]
+		for i in range(len(hierarchy_path) - 1):
+			path.extend(self.unpack(hierarchy_path[i], hierarchy_path[i + 1]))
+		return best, path
+
+	def unpack(self, u, w):
+		"""Return the vertices after u on the original path that edge (u, w) stands for."""
+		vertices = []
+		stack = [(u, w)]
+		while stack:
+			x, y = stack.pop()
+			mid = self.middle.get((x, y))
+			if mid is None:
+				vertices.append(y)
+			else:
+				stack.append((mid, y))  # pushed first, so expanded second
+				stack.append((x, mid))
+		return vertices
+
+
+# Testing
+if __name__ == "__main__":
+
+	from random import seed
+	from generate_random_graph import generate_random_graph, path_weight, textbook_example
+	from dijkstra import dijkstra
+
+	seed(4)
+
+	# Textbook example from dijkstra.py.
+	vertices, graph1 = textbook_example()
+	ch1 = ContractionHierarchy(graph1)
+	dist, path = ch1.query(vertices.index('s'), vertices.index('x'))
+	print("s to x: dist = " + str(dist) + ", path = " + str([vertices[v] for v in path]))
+	print()
+
+	# Every pair agrees with dijkstra, directed and undirected.
+	card_V = 120
+	# With core_degree, vertices of higher degree are set aside while the rest are
+	# still contracted, so queries also cross a core.
+	for directed, core_degree in [(True, None), (False, None), (True, 4), (False, 4)]:
+		graph2 = generate_random_graph(card_V, 0.04, True, directed, True, 0, 15)
+		ch2 = ContractionHierarchy(graph2, core_degree=core_degree)
+		all_equal = True
+		for s in range(card_V):
+			d, pi = dijkstra(graph2, s)
+			for t in range(card_V):
+				dist, path = ch2.query(s, t)
+				if dist != d[t] or (path is not None and (path[0] != s or path[-1] != t
+															or path_weight(graph2, path) != dist)):
+					print("Mismatch for", s, t)
+					all_equal = False
+		print(("Directed" if directed else "Undirected") + " contraction hierarchy distances and paths are "
+			  + ("not " if not all_equal else "") + "equal, shortcuts:", ch2.get_shortcut_count(), "core:", ch2.get_core_size())
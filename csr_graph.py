@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# csr_graph.py
+
+"""Frozen, array-backed graph in compressed sparse row (CSR) form.
+
+The neighbors of vertex u are targets[offsets[u]:offsets[u+1]], with matching
+weights in the same positions of the weights array.  The graph offers the same
+read-only interface as AdjacencyListGraph (get_card_V, get_adj_list, and so on),
+so that bfs, dfs, dijkstra, kruskal, and prim run on it unchanged.
+"""
+
+from array import array
+from numbers import Integral, Real
+from adjacency_list_graph import AdjacencyListGraph, Edge, is_vertex_number
+
+
+class CSRGraph:
+
+	def __init__(self, card_V, offsets, targets, weights=None, directed=True, card_E=None):
+		"""Initialize a graph from already-built CSR arrays.  Normally called by
+		from_edges or from_adjacency_list_graph rather than directly.
+
+		Arguments:
+		card_V -- number of vertices in this graph
+		offsets -- array of card_V + 1 positions into targets
+		targets -- array holding the neighbors of every vertex, row by row
+		weights -- array of edge weights parallel to targets, None if unweighted
+		directed -- boolean indicating whether the graph is directed
+		card_E -- number of edges, defaults to len(targets) for a directed graph
+		and len(targets) // 2 for an undirected graph
+		"""
+		if len(offsets) != card_V + 1:
+			raise RuntimeError("Offsets array must have " + str(card_V + 1) + " entries.")
+		if weights is not None and len(weights) != len(targets):
+			raise RuntimeError("Weights array must be parallel to targets array.")
+		self.card_V = card_V
+		self.offsets = offsets
+		self.targets = targets
+		self.weights = weights
+		self.directed = directed
+		self.weighted = weights is not None
+		if card_E is None:
+			card_E = len(targets) if directed else len(targets) // 2
+		self.card_E = card_E
+
+	@classmethod
+	def from_edges(cls, card_V, edges, directed=True, weighted=False):
+		"""Build a CSR graph from an edge list.  Neighbors of each vertex keep the
+		order in which their edges appear in the list, matching the order that
+		AdjacencyListGraph.insert_edge would give them.  The graph is frozen, so
+		every edge is checked first, and a RuntimeError is raised for whatever
+		insert_edge would reject: an endpoint that is not a vertex number, a
+		missing weight, a self-loop in an undirected graph, or a parallel edge.
+
+		Arguments:
+		card_V -- number of vertices
+		edges -- iterable of (u, v) pairs, or (u, v, weight) triples if weighted
+		directed -- boolean indicating whether the graph is directed
+		weighted -- boolean indicating whether edges are weighted
+		"""
+		sources = []
+		dests = []
+		edge_weights = []
+		seen = set()
+		for edge in edges:
+			if len(edge) < (3 if weighted else 2):
+				raise RuntimeError("Edge " + str(tuple(edge)) + " should be a "
+								   + ("(u, v, weight) triple." if weighted else "(u, v) pair."))
+			u, v = edge[0], edge[1]
+			if not (is_vertex_number(u) and is_vertex_number(v) and 0 <= u < card_V and 0 <= v < card_V):
+				raise RuntimeError("Edge (" + str(u) + ", " + str(v) + ") has an endpoint that is not a vertex "
+								   "from 0 to " + str(card_V - 1) + ".")
+			u, v = int(u), int(v)
+			if weighted and not isinstance(edge[2], Real):
+				raise RuntimeError("Edge (" + str(u) + ", " + str(v) + ") has weight " + str(edge[2])
+								   + ", which is not a number.")
+			if not directed and u == v:
+				raise RuntimeError("Cannot insert self-loop (" + str(u) + ", " + str(v) + ") into undirected graph")
+			key = (u, v) if directed or u < v else (v, u)
+			if key in seen:
+				raise RuntimeError("An edge (" + str(u) + ", " + str(v) + ") already exists.")
+			seen.add(key)
+			sources.append(u)
+			dests.append(v)
+			if weighted:
+				edge_weights.append(edge[2])
+		card_E = len(sources)
+
+		# Undirected edges are stored in both directions.  Interleave them so
+		# that each row sees its edges in list order.
+		if not directed:
+			both_sources = []
+			both_dests = []
+			both_weights = []
+			for i in range(card_E):
+				both_sources.append(sources[i])
+				both_dests.append(dests[i])
+				both_sources.append(dests[i])
+				both_dests.append(sources[i])
+				if weighted:
+					both_weights.append(edge_weights[i])
+					both_weights.append(edge_weights[i])
+			sources, dests, edge_weights = both_sources, both_dests, both_weights
+
+		# Counting sort by source vertex, which is stable.
+		offsets = array('q', [0] * (card_V + 1))
+		for u in sources:
+			offsets[u + 1] += 1
+		for u in range(card_V):
+			offsets[u + 1] += offsets[u]
+		targets = array('i', [0] * len(sources))
+		if weighted:
+			weights = array(weight_typecode(edge_weights), [0] * len(sources))
+		else:
+			weights = None
+		next_slot = offsets[:card_V]
+		for i in range(len(sources)):
+			u = sources[i]
+			j = next_slot[u]
+			targets[j] = dests[i]
+			if weighted:
+				weights[j] = edge_weights[i]
+			next_slot[u] = j + 1
+
+		return cls(card_V, offsets, targets, weights, directed, card_E)
+
+	@classmethod
+	def from_adjacency_list_graph(cls, G):
+		"""Build a CSR graph holding the same edges, in the same adjacency order, as G."""
+		card_V = G.get_card_V()
+		weighted = G.is_weighted()
+		offsets = array('q', [0] * (card_V + 1))
+		targets = array('i')
+		edge_weights = []
+		for u in range(card_V):
+			for edge in G.get_adj_list(u):
+				targets.append(edge.get_v())
+				if weighted:
+					edge_weights.append(edge.get_weight())
+			offsets[u + 1] = len(targets)
+		weights = array(weight_typecode(edge_weights), edge_weights) if weighted else None
+		return cls(card_V, offsets, targets, weights, G.is_directed(), G.get_card_E())
+
+	def get_card_V(self):
+		"""Return the number of vertices in this graph."""
+		return self.card_V
+
+	def get_card_E(self):
+		"""Return the number of edges in this graph."""
+		return self.card_E
+
+	def get_adj_list(self, u):
+		"""Return an iterator for the adjacency list of vertex u.  Yields Edge
+		objects, so that code written for AdjacencyListGraph works unchanged."""
+		targets = self.targets
+		if self.weighted:
+			weights = self.weights
+			for i in range(self.offsets[u], self.offsets[u + 1]):
+				yield Edge(targets[i], weights[i])
+		else:
+			for i in range(self.offsets[u], self.offsets[u + 1]):
+				yield Edge(targets[i])
+
+	def get_neighbors(self, u):
+		"""Return an array of the neighbors of vertex u, without building Edge objects."""
+		return self.targets[self.offsets[u]:self.offsets[u + 1]]
+
+	def get_weights(self, u):
+		"""Return an array of the weights of the edges leaving u, parallel to get_neighbors(u)."""
+		return self.weights[self.offsets[u]:self.offsets[u + 1]]
+
+	def get_degree(self, u):
+		"""Return the number of edges leaving vertex u."""
+		return self.offsets[u + 1] - self.offsets[u]
+
+	def is_directed(self):
+		"""Return a boolean indicating whether this graph is directed."""
+		return self.directed
+
+	def is_weighted(self):
+		"""Return a boolean indicating whether this graph is weighted."""
+		return self.weighted
+
+	def get_version(self):
+		"""Return the graph version, which is always 0 because a CSR graph never changes."""
+		return 0
+
+	def insert_edge(self, u, v, weight=None):
+		"""CSR graphs are frozen; convert with to_adjacency_list_graph to modify."""
+		raise RuntimeError("Cannot insert edge (" + str(u) + ", " + str(v) + ") into a frozen CSR graph.")
+
+	def delete_edge(self, u, v, delete_undirected=True):
+		"""CSR graphs are frozen; convert with to_adjacency_list_graph to modify."""
+		raise RuntimeError("Cannot delete edge (" + str(u) + ", " + str(v) + ") from a frozen CSR graph.")
+
+	def find_index(self, u, v):
+		"""Return the position of edge (u, v) in the targets array, or None if absent."""
+		try:
+			return self.targets.index(v, self.offsets[u], self.offsets[u + 1])
+		except ValueError:
+			return None
+
+	def find_edge(self, u, v):
+		"""Return an edge object for edge (u, v) if (u, v) is in this graph, None otherwise."""
+		i = self.find_index(u, v)
+		if i is None:
+			return None
+		if self.weighted:
+			return Edge(v, self.weights[i])
+		return Edge(v)
+
+	def has_edge(self, u, v):
+		"""Return True if edge (u, v) is in this graph, False otherwise."""
+		return self.find_index(u, v) is not None
+
+	def get_edge_list(self):
+		"""Return a Python list containing the edges of this graph."""
+		edge_list = []
+		for u in range(self.card_V):
+			for v in self.get_neighbors(u):
+				if self.directed or u < v:
+					edge_list.append((u, v))
+		return edge_list
+
+	def copy(self):
+		"""Return a copy of this graph."""
+		weights = None if self.weights is None else array(self.weights.typecode, self.weights)
+		return CSRGraph(self.card_V, array('q', self.offsets), array('i', self.targets), weights,
+						self.directed, self.card_E)
+
+	def transpose(self):
+		"""Return the transpose of this graph."""
+		if not self.directed:
+			return self.copy()
+		edges = []
+		for u in range(self.card_V):
+			for i in range(self.offsets[u], self.offsets[u + 1]):
+				if self.weighted:
+					edges.append((self.targets[i], u, self.weights[i]))
+				else:
+					edges.append((self.targets[i], u))
+		return CSRGraph.from_edges(self.card_V, edges, True, self.weighted)
+
+	def to_adjacency_list_graph(self):
+		"""Return an AdjacencyListGraph with the same edges, in the same adjacency order."""
+		G = AdjacencyListGraph(self.card_V, self.directed, self.weighted)
+		for u in range(self.card_V):
+			for edge in self.get_adj_list(u):
+				G.adj_lists[u].append(edge)
+		G.card_E = self.card_E
+		return G
+
+	def nbytes(self):
+		"""Return the number of bytes used by the offsets, targets, and weights arrays."""
+		total = self.offsets.itemsize * len(self.offsets) + self.targets.itemsize * len(self.targets)
+		if self.weights is not None:
+			total += self.weights.itemsize * len(self.weights)
+		return total
+
+	def __str__(self):
+		"""Return the adjacency lists formatted as a string."""
+		return self.strmap()
+
+	def strmap(self, mapping_func=None):
+		"""Return the adjacency lists formatted as a string, but mapping vertex numbers
+		by a mapping function.  If mapping_func is None, then do not map."""
+		if mapping_func is None:
+			mapping_func = lambda i: i
+
+		result = ""
+		for i in range(self.card_V):
+			result += str(mapping_func(i)) + ": "
+			for edge in self.get_adj_list(i):
+				result += edge.strmap(mapping_func) + " "
+			result += "\n"
+		return result
+
+
+def weight_typecode(weights):
+	"""Return the array typecode for a list of weights: 'q' if every weight is an
+	integer, so that distances keep printing as integers, and 'd' otherwise."""
+	for w in weights:
+		if not isinstance(w, Integral):
+			return 'd'
+	return 'q'
+
+
+# Testing
+if __name__ == "__main__":
+
+	import time
+	import tracemalloc
+	from generate_random_graph import generate_random_graph, textbook_example
+	from csr_graph import CSRGraph  # the class bfs and dijkstra check for, not this script's copy
+	from bfs import bfs
+	from dfs import dfs
+	from dijkstra import dijkstra
+	from mst import kruskal, prim, get_total_weight
+
+	# Textbook example from dijkstra.py.
+	vertices, graph0 = textbook_example()
+	graph1 = CSRGraph.from_adjacency_list_graph(graph0)
+	print(graph1.strmap(lambda i: vertices[i]))
+	print(graph1.has_edge(0, 1), graph1.has_edge(1, 0))
+	d, pi = dijkstra(graph1, vertices.index('s'))
+	for i in range(len(vertices)):
+		print(vertices[i] + ": d = " + str(d[i]) + ", pi = " + ("None" if pi[i] is None else vertices[pi[i]]))
+	try:
+		graph1.insert_edge(0, 4, 1)
+	except RuntimeError as e:
+		print(e)
+	# Bad edges are rejected up front, as AdjacencyListGraph rejects them.
+	for bad_edges in [[(0, 5)], [(-1, 2)], [(0, 1), (1, 0)], [(0, 1.5)]]:
+		try:
+			CSRGraph.from_edges(3, bad_edges, False)
+			print("Accepted", bad_edges)
+		except RuntimeError as e:
+			print(e)
+	print()
+
+	# Same results as the linked-list backend.
+	graph2 = generate_random_graph(300, 0.03, True, False, True, 1, 20)
+	csr2 = CSRGraph.from_adjacency_list_graph(graph2)
+	print("bfs equal:", bfs(graph2, 0) == bfs(csr2, 0))
+	print("dfs equal:", dfs(graph2) == dfs(csr2))
+	print("dijkstra equal:", dijkstra(graph2, 0) == dijkstra(csr2, 0))
+	print("kruskal equal:", get_total_weight(kruskal(graph2)) == get_total_weight(kruskal(csr2)))
+	print("prim equal:", get_total_weight(prim(graph2, 0)) == get_total_weight(prim(csr2, 0)))
+	print("round trip equal:", str(csr2.to_adjacency_list_graph()) == str(graph2))
+	print()
+
+	# Memory and throughput comparison against the linked-list backend.
+	print("Vertices, Edges, List bytes, CSR bytes, List BFS (ms), CSR BFS (ms), List Dijkstra (ms), CSR Dijkstra (ms)")
+	for card_V in [1000, 2000, 4000]:
+		tracemalloc.start()
+		graph3 = generate_random_graph(card_V, 8 / card_V, True, False, True, 1, 20)
+		list_bytes = tracemalloc.get_traced_memory()[0]
+		tracemalloc.stop()
+		csr3 = CSRGraph.from_adjacency_list_graph(graph3)
+
+		timings = []  # best of 5 runs, since single runs of a few ms are noisy
+		for search in [bfs, dijkstra]:
+			for graph in [graph3, csr3]:
+				best = float('inf')
+				for _ in range(5):
+					start = time.perf_counter()
+					search(graph, 0)
+					best = min(best, time.perf_counter() - start)
+				timings.append(round(best * 1000, 3))
+		print(card_V, graph3.get_card_E(), list_bytes, csr3.nbytes(),
+			  timings[0], timings[1], timings[2], timings[3], sep=", ")
@@ -30,16 +30,24 @@
 #                                                                       #
 #########################################################################
 
+from heapq import heappush, heappop
 from single_source_shortest_paths import initialize_single_source, relax
 from min_heap_priority_queue import MinHeapPriorityQueue
+from indexed_min_heap import IndexedMinHeap
+from csr_graph import CSRGraph
 
 
-def dijkstra(G, s):
+def dijkstra(G, s, queue="min_heap"):
 	"""Solve single-source shortest-paths problem with no negative-weight edges.
 
 	Arguments:
 	G -- a directed, weighted graph
 	s -- index of source vertex
+	queue -- priority queue to use: "min_heap" for MinHeapPriorityQueue with a
+	key function, "indexed" for IndexedMinHeap keyed by vertex number, or "lazy"
+	for a heapq list that holds only reached vertices (see dijkstra_lazy)
+	With every queue, a CSRGraph is read through its neighbor and weight arrays
+	rather than through Edge objects.
 	Assumption:
 	All weights are nonnegative
 
@@ -47,6 +55,12 @@ def dijkstra(G, s):
 	d -- distances from source vertex s
 	pi -- predecessors
 	"""
+	if queue == "indexed":
+		return dijkstra_indexed(G, s)
+	if queue == "lazy":
+		return dijkstra_lazy(G, s)
+	if queue != "min_heap":
+		raise RuntimeError("Unknown priority queue " + str(queue) + ".")
 
 	card_V = G.get_card_V()
 
@@ -57,9 +71,17 @@ def dijkstra(G, s):
 	for u in range(card_V):
 		queue.insert(u)
 
+	csr = isinstance(G, CSRGraph)
+	decrease_key = lambda v: queue.decrease_key(v, d[v])
+
 	while queue.get_size() > 0:  # while the priority queue is not empty
 		u = queue.extract_min()  # extract a vertex with the minimum distance
 
+		if csr:  # no Edge object or closure per edge
+			for v, weight in zip(G.get_neighbors(u), G.get_weights(u)):
+				relax(u, v, weight, d, pi, decrease_key)
+			continue
+
 		# Relax each edge and update d and pi.
 		for edge in G.get_adj_list(u):
 			v = edge.get_v()
@@ -70,20 +92,178 @@ def dijkstra(G, s):
 	return d, pi
 
 
+def dijkstra_indexed(G, s):
+	"""Dijkstra's algorithm using an IndexedMinHeap, whose keys are the distances
+	themselves, so that no key function or per-edge closure is needed.
+	Same arguments and results as dijkstra."""
+	card_V = G.get_card_V()
+
+	d, pi = initialize_single_source(G, s)
+
+	queue = IndexedMinHeap(card_V)
+	queue.insert(s, 0)
+	for u in range(card_V):
+		if u != s:
+			queue.insert(u, d[u])  # infinite keys go straight to the bottom
+	decrease_key = lambda v: queue.decrease_key(v, d[v])
+	csr = isinstance(G, CSRGraph)
+
+	while queue.get_size() > 0:  # while the priority queue is not empty
+		u = queue.extract_min()  # extract a vertex with the minimum distance
+
+		# Relax each edge and update d and pi.
+		if csr:
+			for v, weight in zip(G.get_neighbors(u), G.get_weights(u)):
+				relax(u, v, weight, d, pi, decrease_key)
+		else:
+			for edge in G.get_adj_list(u):
+				relax(u, edge.get_v(), edge.get_weight(), d, pi, decrease_key)
+
+	return d, pi
+
+
+def dijkstra_lazy(G, s):
+	"""Dijkstra's algorithm with lazy insertion.  Only vertices that have been
+	reached are in the priority queue, which is a heapq list of (distance, vertex)
+	pairs.  Instead of decreasing a key, each improvement pushes a new pair, and
+	pairs that are stale by the time they are popped are skipped.  Unreachable
+	vertices are never touched beyond initialization.
+	Same arguments and results as dijkstra."""
+	d, pi = initialize_single_source(G, s)
+
+	csr = isinstance(G, CSRGraph)
+	queue = [(0, s)]
+	while queue:
+		d_u, u = heappop(queue)
+		if d_u > d[u]:  # stale entry, u was already extracted with a smaller distance
+			continue
+
+		# Relax each edge, as relax does, without creating a closure per edge.
+		if csr:
+			for v, weight in zip(G.get_neighbors(u), G.get_weights(u)):
+				d_v = d_u + weight
+				if d[v] > d_v:
+					d[v] = d_v
+					pi[v] = u
+					heappush(queue, (d_v, v))
+			continue
+		for edge in G.get_adj_list(u):
+			v = edge.get_v()
+			d_v = d_u + edge.get_weight()
+			if d[v] > d_v:
+				d[v] = d_v
+				pi[v] = u
+				heappush(queue, (d_v, v))
+
+	return d, pi
+
+
+def shortest_path(G, s, t, settle_func=None):
+	"""Find a shortest path from s to t, stopping as soon as t is extracted from the
+	priority queue, so that only vertices closer to s than t are settled.
+
+	Arguments:
+	G -- a directed, weighted graph
+	s -- index of source vertex
+	t -- index of target vertex
+	settle_func -- function called upon extracting a vertex with its final distance,
+	taking the vertex as an argument.  Defaults to do nothing.
+	Assumption:
+	All weights are nonnegative
+
+	Returns:
+	dist -- weight of a shortest path from s to t, infinity if t is unreachable
+	path -- list of vertices on a shortest path from s to t, None if t is unreachable
+	"""
+	d, pi = initialize_single_source(G, s)
+
+	queue = [(0, s)]
+	while queue:
+		d_u, u = heappop(queue)
+		if d_u > d[u]:  # stale entry
+			continue
+		if settle_func is not None:
+			settle_func(u)
+		if u == t:
+			return d_u, path_to(pi, s, t)
+
+		for edge in G.get_adj_list(u):
+			v = edge.get_v()
+			d_v = d_u + edge.get_weight()
+			if d[v] > d_v:
+				d[v] = d_v
+				pi[v] = u
+				heappush(queue, (d_v, v))
+
+	return float('inf'), None
+
+
+def multi_source_dijkstra(G, sources):
+	"""Find, for every vertex, its distance from the nearest of several sources, as
+	if a new vertex had a 0-weight edge to each source and Dijkstra's algorithm ran
+	from it.  Uses a heapq list with lazy insertion, as dijkstra_lazy does.
+
+	Arguments:
+	G -- a directed, weighted graph
+	sources -- nonempty list of indices of source vertices
+	Assumption:
+	All weights are nonnegative
+
+	Returns:
+	d -- distances from the nearest source
+	pi -- predecessors, None for the sources and unreachable vertices
+	nearest -- nearest[v] is the source that v is closest to, None if v is unreachable
+	"""
+	if len(sources) == 0:
+		raise RuntimeError("Multi-source search needs at least one source.")
+	d, pi = initialize_single_source(G, sources[0])
+	nearest = [None] * G.get_card_V()
+	queue = []
+	for s in sources:
+		d[s] = 0
+		nearest[s] = s
+		queue.append((0, s))
+
+	while queue:
+		d_u, u = heappop(queue)
+		if d_u > d[u]:  # stale entry
+			continue
+
+		# Relax each edge; the nearest source is passed along with the predecessor.
+		for edge in G.get_adj_list(u):
+			v = edge.get_v()
+			d_v = d_u + edge.get_weight()
+			if d[v] > d_v:
+				d[v] = d_v
+				pi[v] = u
+				nearest[v] = nearest[u]
+				heappush(queue, (d_v, v))
+
+	return d, pi, nearest
+
+
+def path_to(pi, s, v):
+	"""Return the list of vertices on the path from s to v given by predecessors pi,
+	or None if there is no such path.  Same result as print_path with the identity
+	mapping, but iterative, so that long paths do not hit the recursion limit."""
+	path = [v]
+	while v != s:
+		v = pi[v]
+		if v is None:
+			return None
+		path.append(v)
+	path.reverse()
+	return path
+
+
 # Testing
 if __name__ == "__main__":
 
-	from adjacency_list_graph import AdjacencyListGraph
 	from bellman_ford import bellman_ford
-	from generate_random_graph import generate_random_graph
+	from generate_random_graph import generate_random_graph, path_weight, textbook_example
 
 	# Textbook example. 
-	vertices = ['s', 't', 'x', 'y', 'z']
-	edges = [('s', 't', 10), ('s', 'y', 5), ('t', 'x', 1), ('t', 'y', 2), ('x', 'z', 4),
-			('y', 't', 3), ('y', 'x', 9), ('y', 'z', 2), ('z', 's', 7), ('z', 'x', 6)]
-	graph1 = AdjacencyListGraph(len(vertices), True, True)
-	for edge in edges:
-		graph1.insert_edge(vertices.index(edge[0]), vertices.index(edge[1]), edge[2])
+	vertices, graph1 = textbook_example()
 	d, pi = dijkstra(graph1, vertices.index('s'))
 	for i in range(len(vertices)):
 		print(vertices[i] + ": d = " + str(d[i]) + ", pi = " + ("None" if pi[i] is None else vertices[pi[i]]))
@@ -98,8 +278,38 @@ if __name__ == "__main__":
 	for s in range(card_V):
 		dijkstra_d, dijkstra_pi = dijkstra(graph2, s)
 		bf_d, bf_pi, cycle = bellman_ford(graph2, s)
-		if bf_d != dijkstra_d:
+		indexed_d, indexed_pi = dijkstra(graph2, s, queue="indexed")
+		lazy_d, lazy_pi = dijkstra(graph2, s, queue="lazy")
+		if bf_d != dijkstra_d or indexed_d != dijkstra_d or lazy_d != dijkstra_d:
 			print("Shortest-path distances mismatch for source vertex", s)
 			all_equal = False
 		# Don't check whether pi values are equal because shortest paths might not be unique.
-	print("All shortest-path distances are " + ("not " if not all_equal else "") + "equal")
\ No newline at end of file
+	print("All shortest-path distances are " + ("not " if not all_equal else "") + "equal")
+
+	# Point-to-point queries agree with the full search and settle fewer vertices.
+	all_equal = True
+	settled = 0
+	for s in range(card_V):
+		dijkstra_d, dijkstra_pi = dijkstra(graph2, s)
+		for t in range(0, card_V, 7):
+			counter = []
+			dist, path = shortest_path(graph2, s, t, counter.append)
+			settled += len(counter)
+			if dist != dijkstra_d[t] or (path is not None and (path[0] != s or path[-1] != t
+															   or path_weight(graph2, path) != dist)):
+				print("Point-to-point mismatch for", s, t)
+				all_equal = False
+	print("All point-to-point distances are " + ("not " if not all_equal else "") + "equal")
+	print("Average vertices settled per query:", settled / (card_V * len(range(0, card_V, 7))), "of", card_V)
+
+	# Multi-source distances are the minimum over single-source distances.
+	sources = [3, 40, 77]
+	multi_d, multi_pi, nearest = multi_source_dijkstra(graph2, sources)
+	single_d = [dijkstra(graph2, s)[0] for s in sources]
+	all_equal = True
+	for v in range(card_V):
+		best = min(single_d[i][v] for i in range(len(sources)))
+		if multi_d[v] != best or (best != float('inf') and single_d[sources.index(nearest[v])][v] != best):
+			print("Multi-source mismatch for vertex", v)
+			all_equal = False
+	print("All multi-source distances are " + ("not " if not all_equal else "") + "equal")
@@ -30,6 +30,9 @@
 #                                                                       #
 #########################################################################
 
+from array import array
+
+
 class ForestNode:
 
 	def __init__(self, data):
@@ -90,6 +93,80 @@ def print_find_path(x):
 	print(x)
 
 
+class DisjointSetForest:
+
+	def __init__(self, n):
+		"""Initialize n singleton sets, one for each of the elements 0 to n - 1.  Parents
+		and ranks are kept in compact integer arrays instead of a ForestNode per element."""
+		self.parent = array('q', range(n))  # each root is its own parent
+		self.rank = array('B', bytes(n))     # ranks never exceed log2(n), so one byte each
+		self.set_count = n
+
+	def get_size(self):
+		"""Return the number of elements."""
+		return len(self.parent)
+
+	def count(self):
+		"""Return the number of disjoint sets."""
+		return self.set_count
+
+	def find_set(self, x):
+		"""Return the root of the set containing x, pointing every node on the find
+		path directly at the root.  Two passes up the path instead of recursion."""
+		parent = self.parent
+		root = x
+		while parent[root] != root:
+			root = parent[root]
+		while parent[x] != root:
+			next_x = parent[x]
+			parent[x] = root
+			x = next_x
+		return root
+
+	def same_set(self, x, y):
+		"""Return a boolean indicating whether x and y are in the same set."""
+		return self.find_set(x) == self.find_set(y)
+
+	def union(self, x, y):
+		"""Unite the sets containing x and y, linking by rank.  Return True if they
+		were different sets, False if they were already the same set."""
+		x = self.find_set(x)
+		y = self.find_set(y)
+		if x == y:
+			return False
+		rank = self.rank
+		# The root with larger rank becomes the parent of the root with the smaller rank.
+		if rank[x] > rank[y]:
+			self.parent[y] = x
+		else:
+			self.parent[x] = y
+			if rank[x] == rank[y]:
+				rank[y] += 1
+		self.set_count -= 1
+		return True
+
+	def union_many(self, pairs):
+		"""Unite the sets for each (x, y) pair in an iterable, such as a list of edges.
+		Return the number of unions that joined two different sets."""
+		joined = 0
+		for pair in pairs:
+			if self.union(pair[0], pair[1]):
+				joined += 1
+		return joined
+
+	def component_labels(self):
+		"""Return a list giving each element the number of its set, with sets numbered
+		from 0 in order of their smallest element."""
+		labels = [0] * len(self.parent)
+		label_by_root = {}
+		for x in range(len(self.parent)):
+			root = self.find_set(x)
+			if root not in label_by_root:
+				label_by_root[root] = len(label_by_root)
+			labels[x] = label_by_root[root]
+		return labels
+
+
 # Testing
 if __name__ == "__main__":
 
@@ -119,3 +196,20 @@ if __name__ == "__main__":
 	union(sets[0], sets[4])
 	for s in sets:
 		print_find_path(s)
+	print()
+
+	# Array-backed forest: the same unions, then a long chain that would be too deep
+	# for the recursive find_set.
+	forest = DisjointSetForest(len(letters))
+	forest.union_many([(0, 1), (2, 3), (4, 5), (6, 7), (0, 2), (4, 6)])
+	print(forest.count(), "sets, labels", forest.component_labels())
+	forest.union(0, 4)
+	print(forest.count(), "set, a and h together:", forest.same_set(0, 7))
+
+	n = 1000000
+	forest = DisjointSetForest(n)
+	for x in range(n - 1):
+		forest.parent[x] = x + 1  # worst-case chain, built directly
+	forest.set_count = 1
+	print("Root of a chain of", n, "elements:", forest.find_set(0), "; after compression, parent of 0:",
+		  forest.parent[0], "; labels used:", max(forest.component_labels()) + 1)
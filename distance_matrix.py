@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# distance_matrix.py
+
+"""All-pairs shortest-path distances and predecessors held in NumPy arrays.
+
+Row s of the distance matrix is the d computed by a single-source search from s,
+and row s of the predecessor matrix is its pi, with -1 in place of None.  Once
+built, the weight of a shortest path between any pair is one array lookup, and
+the path itself is recovered by following predecessors back from the target.
+The matrices can be saved as .npy files and memory-mapped on later runs, so
+that only the rows actually used are read from disk."""
+
+import hashlib
+import os
+import numpy as np
+from adjacency_list_graph import AdjacencyListGraph
+from bellman_ford import bellman_ford
+from dijkstra import dijkstra
+
+INF = float('inf')
+NO_PREDECESSOR = -1
+
+
+class DistanceMatrix:
+
+	def __init__(self, dist, pred):
+		"""Initialize from already-computed matrices.  Normally called by build or
+		load rather than directly.
+
+		Arguments:
+		dist -- card_V x card_V array, where dist[s, v] is the weight of a shortest
+		path from s to v.  A float array holds infinity for unreachable pairs; an
+		integer array holds its largest value instead.
+		pred -- card_V x card_V integer array, where pred[s, v] is the predecessor
+		of v on a shortest path from s, or -1 if there is none
+		"""
+		self.dist = dist
+		self.pred = pred
+		if np.issubdtype(dist.dtype, np.integer):
+			self.unreachable = np.iinfo(dist.dtype).max
+		else:
+			self.unreachable = INF
+
+	@classmethod
+	def build(cls, G, method="auto"):
+		"""Compute shortest paths between all pairs of vertices of G.
+
+		Arguments:
+		G -- a weighted graph with no negative-weight cycles
+		method -- "dijkstra" to run dijkstra from every vertex (nonnegative weights
+		only), "johnson" to reweight with bellman_ford first so that negative weights
+		are allowed, "floyd_warshall" for the Floyd-Warshall procedure on an adjacency
+		matrix, or "auto" to choose: Floyd-Warshall for a dense graph, otherwise
+		repeated Dijkstra, or Johnson if some weight is negative.
+		"""
+		card_V = G.get_card_V()
+		edges = [(u, edge.get_v(), edge.get_weight()) for u in range(card_V) for edge in G.get_adj_list(u)]
+
+		if method == "auto":
+			if len(edges) >= card_V * card_V // 4:
+				method = "floyd_warshall"
+			elif any(weight < 0 for (u, v, weight) in edges):
+				method = "johnson"
+			else:
+				method = "dijkstra"
+
+		if method == "dijkstra":
+			dist, pred = repeated_dijkstra(G, card_V)
+		elif method == "johnson":
+			dist, pred = johnson(G, card_V, edges)
+		elif method == "floyd_warshall":
+			dist, pred = floyd_warshall(card_V, edges)
+		else:
+			raise RuntimeError("Unknown all-pairs method " + str(method) + ".")
+
+		# Integer weights give integer distances, stored in the smallest type that holds them.
+		if all(isinstance(weight, (int, np.integer)) for (u, v, weight) in edges):
+			reachable = dist[np.isfinite(dist)]
+			largest = max(abs(reachable.max()), abs(reachable.min())) if reachable.size > 0 else 0
+			dtype = np.int32 if largest < np.iinfo(np.int32).max else np.int64
+			dist = np.where(np.isfinite(dist), dist, np.iinfo(dtype).max).astype(dtype)
+
+		return cls(dist, pred)
+
+	@classmethod
+	def load(cls, path, mmap=True):
+		"""Read matrices written by save.  With mmap true, the files are memory-mapped
+		read-only rather than read into memory."""
+		mode = 'r' if mmap else None
+		dist = np.load(path + "_dist.npy", mmap_mode=mode)
+		pred = np.load(path + "_pred.npy", mmap_mode=mode)
+		return cls(dist, pred)
+
+	@classmethod
+	def cached(cls, G, path, method="auto"):
+		"""Load the matrices for G from the files at path, or build and save them if
+		the files do not exist or were saved for a different graph.  The graph is
+		identified by graph_fingerprint, saved in path + "_fingerprint.txt", so any
+		change to its vertices, edges, or weights causes a rebuild."""
+		fingerprint = graph_fingerprint(G)
+		if all(os.path.exists(path + suffix) for suffix in ["_dist.npy", "_pred.npy", "_fingerprint.txt"]):
+			with open(path + "_fingerprint.txt") as f:
+				saved_fingerprint = f.read().strip()
+			if saved_fingerprint == fingerprint:
+				return cls.load(path)
+		matrix = cls.build(G, method)
+		matrix.save(path, fingerprint)
+		return matrix
+
+	def save(self, path, fingerprint=None):
+		"""Write the matrices to path + "_dist.npy" and path + "_pred.npy", and the
+		fingerprint of their graph, if given, to path + "_fingerprint.txt"."""
+		np.save(path + "_dist.npy", self.dist)
+		np.save(path + "_pred.npy", self.pred)
+		if fingerprint is not None:
+			with open(path + "_fingerprint.txt", 'w') as f:
+				f.write(fingerprint + "\n")
+
+	def get_card_V(self):
+		"""Return the number of vertices."""
+		return self.dist.shape[0]
+
+	def nbytes(self):
+		"""Return the number of bytes in the two matrices."""
+		return self.dist.nbytes + self.pred.nbytes
+
+	def distance(self, s, t):
+		"""Return the weight of a shortest path from s to t, infinity if t is unreachable."""
+		value = self.dist[s, t]
+		if value == self.unreachable:
+			return INF
+		return value.item()
+
+	def path(self, s, t):
+		"""Return the list of vertices on a shortest path from s to t, None if t is unreachable."""
+		if s != t and self.pred[s, t] == NO_PREDECESSOR:
+			return None
+		row = self.pred[s]
+		path = [t]
+		v = t
+		while v != s:
+			v = int(row[v])
+			path.append(v)
+		path.reverse()
+		return path
+
+	def get_distances(self, s):
+		"""Return the list of distances from s to every vertex, as dijkstra returns d."""
+		return [INF if value == self.unreachable else value for value in self.dist[s].tolist()]
+
+
+def graph_fingerprint(G):
+	"""Return a hex digest identifying G: its number of vertices, whether it is
+	directed, and every edge with its weight, in adjacency-list order (which
+	decides between equally short paths)."""
+	digest = hashlib.sha256()
+	digest.update(repr((G.get_card_V(), G.is_directed())).encode())
+	for u in range(G.get_card_V()):
+		digest.update(repr([(edge.get_v(), edge.get_weight()) for edge in G.get_adj_list(u)]).encode())
+	return digest.hexdigest()
+
+
+def repeated_dijkstra(G, card_V):
+	"""Return float distance and predecessor matrices from dijkstra run from every vertex."""
+	dist = np.empty((card_V, card_V), dtype=np.float64)
+	pred = np.empty((card_V, card_V), dtype=np.int32)
+	for s in range(card_V):
+		d, pi = dijkstra(G, s, queue="lazy")
+		dist[s] = d
+		pred[s] = [NO_PREDECESSOR if p is None else p for p in pi]
+	return dist, pred
+
+
+def johnson(G, card_V, edges):
+	"""Return float distance and predecessor matrices by Johnson's algorithm: reweight
+	the edges with potentials from bellman_ford so that none is negative, run dijkstra
+	from every vertex, and undo the reweighting.  Reweighting changes every path
+	between the same two vertices by the same amount, so the predecessors carry over."""
+	s = card_V  # extra vertex with 0-weight edges to all others
+	G_prime = AdjacencyListGraph(card_V + 1, True, True)
+	for v in range(card_V):
+		G_prime.insert_edge(s, v, 0)
+	for (u, v, weight) in edges:
+		G_prime.insert_edge(u, v, weight)
+	h, pi, no_negative_cycle = bellman_ford(G_prime, s)
+	if not no_negative_cycle:
+		raise RuntimeError("The graph contains a negative-weight cycle.")
+
+	reweighted = AdjacencyListGraph(card_V, True, True)
+	for (u, v, weight) in edges:
+		reweighted.insert_edge(u, v, weight + h[u] - h[v])
+	dist, pred = repeated_dijkstra(reweighted, card_V)
+	h = np.array(h[:card_V], dtype=np.float64)
+	dist += h[np.newaxis, :] - h[:, np.newaxis]  # infinity stays infinity
+	return dist, pred
+
+
+def floyd_warshall(card_V, edges):
+	"""Return float distance and predecessor matrices by the Floyd-Warshall procedure,
+	updating a whole matrix per intermediate vertex k rather than one entry at a time."""
+	dist = np.full((card_V, card_V), INF)
+	pred = np.full((card_V, card_V), NO_PREDECESSOR, dtype=np.int32)
+	for (u, v, weight) in edges:
+		if weight < dist[u, v]:
+			dist[u, v] = weight
+			pred[u, v] = u
+	for v in range(card_V):
+		if dist[v, v] > 0:
+			dist[v, v] = 0
+			pred[v, v] = NO_PREDECESSOR
+
+	for k in range(card_V):
+		# A path through k beats the best so far; its last step is the last step from k.
+		through_k = dist[:, k, np.newaxis] + dist[np.newaxis, k, :]
+		better = through_k < dist
+		dist = np.where(better, through_k, dist)
+		pred = np.where(better, pred[np.newaxis, k, :], pred)
+
+	if (np.diagonal(dist) < 0).any():
+		raise RuntimeError("The graph contains a negative-weight cycle.")
+	return dist, pred
+
+
+# Testing
+if __name__ == "__main__":
+
+	import tempfile
+	import time
+	from random import randint, randrange, seed
+	from generate_random_graph import generate_random_graph, generate_random_network, path_weight
+
+	seed(11)
+
+	# Every method agrees with dijkstra, and every path has the stored weight.
+	card_V = 80
+	for directed in [True, False]:
+		graph1 = generate_random_graph(card_V, 0.06, True, directed, True, 0, 15)
+		expected = [dijkstra(graph1, s)[0] for s in range(card_V)]
+		for method in ["dijkstra", "johnson", "floyd_warshall"]:
+			matrix = DistanceMatrix.build(graph1, method)
+			all_equal = True
+			for s in range(card_V):
+				if matrix.get_distances(s) != expected[s]:
+					all_equal = False
+				for t in range(card_V):
+					path = matrix.path(s, t)
+					if (path is None) != (expected[s][t] == INF) or \
+							(path is not None and (path[0] != s or path[-1] != t
+													or path_weight(graph1, path) != matrix.distance(s, t))):
+						print("Path mismatch for", s, t, method)
+						all_equal = False
+			print(("Directed" if directed else "Undirected"), method, "distances and paths are "
+				  + ("not " if not all_equal else "") + "equal,", matrix.dist.dtype)
+
+	# Negative weights without negative cycles: edges only go from lower to higher vertices.
+	graph2 = AdjacencyListGraph(card_V, True, True)
+	for u in range(card_V):
+		for v in range(u + 1, card_V):
+			if randrange(10) == 0:
+				graph2.insert_edge(u, v, randint(-5, 15))
+	johnson_matrix = DistanceMatrix.build(graph2, "johnson")
+	fw_matrix = DistanceMatrix.build(graph2, "floyd_warshall")
+	all_equal = True
+	for s in range(card_V):
+		bf_d, bf_pi, no_cycle = bellman_ford(graph2, s)
+		if johnson_matrix.get_distances(s) != bf_d or fw_matrix.get_distances(s) != bf_d:
+			all_equal = False
+	print("Negative weights: Johnson and Floyd-Warshall distances are "
+		  + ("not " if not all_equal else "") + "equal to bellman_ford")
+	print()
+
+	# Build once, then memory-map on later runs.
+	card_V = 1000
+	graph3 = generate_random_network(card_V, 2 * card_V)
+	path = os.path.join(tempfile.mkdtemp(), "network")
+	start = time.perf_counter()
+	matrix = DistanceMatrix.cached(graph3, path)
+	print("Built", card_V, "x", card_V, "matrices in", round(time.perf_counter() - start, 2), "s,",
+		  matrix.nbytes() // 1024, "KiB")
+	start = time.perf_counter()
+	matrix = DistanceMatrix.cached(graph3, path)
+	print("Memory-mapped them in", round((time.perf_counter() - start) * 1000, 2), "ms")
+
+	# Changing a weight changes the fingerprint, so the stale files are not reused.
+	u, v = graph3.get_edge_list()[0]
+	graph3.set_edge_weight(u, v, graph3.find_edge(u, v).get_weight() + 100)
+	rebuilt = DistanceMatrix.cached(graph3, path)
+	print("After a weight change the cache was " + ("rebuilt" if not isinstance(rebuilt.dist, np.memmap)
+												  else "reused") + ", distances "
+		  + ("agree" if rebuilt.get_distances(u) == dijkstra(graph3, u)[0] else "disagree") + " with dijkstra")
+	graph3.set_edge_weight(u, v, graph3.find_edge(u, v).get_weight() - 100)
+	matrix = DistanceMatrix.cached(graph3, path)
+
+	queries = [(randrange(card_V), randrange(card_V)) for _ in range(1000)]
+	start = time.perf_counter()
+	results = [(matrix.distance(s, t), matrix.path(s, t)) for s, t in queries]
+	print("Matrix lookup with path:", round((time.perf_counter() - start) / len(queries) * 1000, 4), "ms per query")
+	from dijkstra import shortest_path
+	start = time.perf_counter()
+	expected = [shortest_path(graph3, s, t) for s, t in queries]
+	print("shortest_path:", round((time.perf_counter() - start) / len(queries) * 1000, 4), "ms per query")
+	print("Distances " + ("agree" if [r[0] for r in results] == [e[0] for e in expected] else "disagree"))
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# dynamic_mst.py
+
+"""Minimum spanning forest maintained under edge updates.
+
+Inserting edge (u, v) closes a cycle through the tree path from u to v; by the
+cycle property, the heaviest edge on that cycle is in no minimum spanning tree,
+so the new edge replaces the heaviest path edge if it is lighter.  Deleting a
+tree edge splits its tree in two; by the cut property, the lightest remaining
+edge crossing between the halves reconnects them.  The smaller half is found by
+searching both halves in lockstep, so only it and the edges leaving it are
+examined.  Either way the work is proportional to one tree of the forest,
+rather than to sorting every edge of the graph again."""
+
+from adjacency_list_graph import AdjacencyListGraph
+from disjoint_set_forest import DisjointSetForest
+from mst import kruskal_fast
+
+
+class DynamicMST:
+
+	def __init__(self, G, tree=None):
+		"""Initialize from a graph and optionally a minimum spanning tree of it.
+
+		Arguments:
+		G -- a weighted, undirected AdjacencyListGraph, changed only through this
+		structure once it is built (see AdjacencyListGraph.check_version)
+		tree -- a minimum spanning tree of G, as returned by kruskal or prim, or None
+		to run kruskal_fast.  If G is disconnected, it must span every component, so
+		prim's tree, which spans only the root's component, is accepted only for a
+		connected graph.
+		"""
+		if G.is_directed():
+			raise RuntimeError("Graph should be undirected.")
+		if tree is None:
+			tree = kruskal_fast(G)
+		card_V = G.get_card_V()
+		self.G = G
+		self.version = G.get_version()
+
+		# tree_adj[u] maps each tree neighbor v of u to the weight of edge (u, v).
+		self.tree_adj = [{} for _ in range(card_V)]
+		for u in range(card_V):
+			for edge in tree.get_adj_list(u):
+				v = edge.get_v()
+				if u < v:
+					if not G.has_edge(u, v):
+						raise RuntimeError("Tree edge (" + str(u) + ", " + str(v) + ") is not in the graph.")
+					self.add_tree_edge(u, v, edge.get_weight())
+
+		# A spanning forest has one edge fewer than vertices per component of G.
+		forest = DisjointSetForest(card_V)
+		for u in range(card_V):
+			for edge in G.get_adj_list(u):
+				forest.union(u, edge.get_v())
+		if self.get_card_E() != card_V - forest.count():
+			raise RuntimeError("The tree does not span every component of the graph.")
+
+	def get_card_E(self):
+		"""Return the number of edges in the spanning forest."""
+		return sum(len(neighbors) for neighbors in self.tree_adj) // 2
+
+	def get_edges(self):
+		"""Return the list of (u, v, weight) edges in the spanning forest, with u < v."""
+		return [(u, v, weight) for u in range(len(self.tree_adj))
+				for v, weight in sorted(self.tree_adj[u].items()) if u < v]
+
+	def get_total_weight(self):
+		"""Return the total weight of the spanning forest."""
+		return sum(weight for (u, v, weight) in self.get_edges())
+
+	def get_tree(self):
+		"""Return the spanning forest as an undirected AdjacencyListGraph."""
+		mst, skipped, duplicates = AdjacencyListGraph.from_edges(len(self.tree_adj), self.get_edges(), False, True)
+		return mst
+
+	def in_tree(self, u, v):
+		"""Return True if edge (u, v) is in the spanning forest."""
+		return v in self.tree_adj[u]
+
+	def insert_edge(self, u, v, weight):
+		"""Insert edge (u, v) with the given weight into the graph and repair the tree.
+		The tree changes only if the new edge is strictly lighter than the heaviest
+		edge on the tree path from u to v, so reopening a closed edge whose
+		replacement has the same weight keeps the replacement.
+
+		Returns:
+		added -- list of (u, v, weight) edges that entered the tree
+		removed -- list of (u, v, weight) edges that left the tree
+		"""
+		self.G.check_version(self.version, "DynamicMST")
+		self.G.insert_edge(u, v, weight)
+		self.version = self.G.get_version()
+		return self.repair_after_decrease(u, v, weight)
+
+	def delete_edge(self, u, v):
+		"""Delete edge (u, v) from the graph and repair the tree.  Returns the lists
+		added and removed, as insert_edge does."""
+		self.G.check_version(self.version, "DynamicMST")
+		self.G.delete_edge(u, v)
+		self.version = self.G.get_version()
+		if not self.in_tree(u, v):
+			return [], []
+		return self.repair_after_increase(u, v)
+
+	def set_edge_weight(self, u, v, weight):
+		"""Change the weight of edge (u, v) and repair the tree.  Returns the lists
+		added and removed, as insert_edge does."""
+		self.G.check_version(self.version, "DynamicMST")
+		old_weight = self.G.find_edge(u, v).get_weight()
+		self.G.set_edge_weight(u, v, weight)
+		self.version = self.G.get_version()
+		if self.in_tree(u, v):
+			self.tree_adj[u][v] = self.tree_adj[v][u] = weight
+			if weight > old_weight:
+				return self.repair_after_increase(u, v)
+			return [], []
+		if weight < old_weight:
+			return self.repair_after_decrease(u, v, weight)
+		return [], []
+
+	def add_tree_edge(self, u, v, weight):
+		"""Put edge (u, v) into the spanning forest, in both directions."""
+		self.tree_adj[u][v] = weight
+		self.tree_adj[v][u] = weight
+
+	def remove_tree_edge(self, u, v):
+		"""Take edge (u, v) out of the spanning forest, in both directions."""
+		del self.tree_adj[u][v]
+		del self.tree_adj[v][u]
+
+	def repair_after_decrease(self, u, v, weight):
+		"""Repair after edge (u, v) was inserted or made lighter, when it is not in the
+		tree: it replaces the heaviest edge on the tree path from u to v, if lighter."""
+		edge = (min(u, v), max(u, v), weight)
+		path = self.tree_path(u, v)
+		if path is None:  # u and v were in different trees, now joined
+			self.add_tree_edge(u, v, weight)
+			return [edge], []
+		heaviest = None
+		for i in range(len(path) - 1):
+			x, y = path[i], path[i + 1]
+			if heaviest is None or self.tree_adj[x][y] > heaviest[2]:
+				heaviest = (min(x, y), max(x, y), self.tree_adj[x][y])
+		if heaviest is None or heaviest[2] <= weight:
+			return [], []
+		self.remove_tree_edge(heaviest[0], heaviest[1])
+		self.add_tree_edge(u, v, weight)
+		return [edge], [heaviest]
+
+	def repair_after_increase(self, u, v):
+		"""Repair after tree edge (u, v) was deleted from the graph or made heavier:
+		take it out of the tree, then reconnect the two halves by the lightest edge
+		of the graph crossing between them, which may be (u, v) itself."""
+		removed = (min(u, v), max(u, v), self.tree_adj[u][v])
+		self.remove_tree_edge(u, v)
+		side = self.smaller_side(u, v)
+
+		best = None
+		for x in side:
+			for edge in self.G.get_adj_list(x):
+				y = edge.get_v()
+				if y not in side and (best is None or edge.get_weight() < best[2]):
+					best = (min(x, y), max(x, y), edge.get_weight())
+		if best is None:  # (u, v) was a bridge, and the tree stays split
+			return [], [removed]
+		self.add_tree_edge(best[0], best[1], best[2])
+		if best[:2] == removed[:2]:  # the same edge is still the lightest
+			return [], []
+		return [best], [removed]
+
+	def smaller_side(self, u, v):
+		"""After the tree edge (u, v) is removed, return the set of vertices in the
+		smaller of the trees containing u and v, searching both at once and stopping
+		as soon as one is exhausted."""
+		sides = [{u}, {v}]
+		stacks = [[u], [v]]
+		while True:
+			for i in (0, 1):
+				if len(stacks[i]) == 0:
+					return sides[i]
+				x = stacks[i].pop()
+				for y in self.tree_adj[x]:
+					if y not in sides[i]:
+						sides[i].add(y)
+						stacks[i].append(y)
+
+	def tree_path(self, u, v):
+		"""Return the list of vertices on the tree path from u to v, None if u and v are
+		in different trees."""
+		parent = {u: None}
+		stack = [u]
+		while len(stack) > 0 and v not in parent:
+			x = stack.pop()
+			for y in self.tree_adj[x]:
+				if y not in parent:
+					parent[y] = x
+					stack.append(y)
+		if v not in parent:
+			return None
+		path = [v]
+		while path[-1] != u:
+			path.append(parent[path[-1]])
+		path.reverse()
+		return path
+
+
+# Testing
+if __name__ == "__main__":
+
+	import time
+	from random import randint, randrange, seed
+	from generate_random_graph import generate_random_graph, generate_random_network
+	from mst import kruskal, prim, get_total_weight
+
+	seed(25)
+
+	# Random updates in random order, checked against kruskal from scratch.
+	graph1 = generate_random_graph(80, 0.06, True, False, True, 1, 12)
+	dynamic = DynamicMST(graph1, kruskal(graph1))
+	all_equal = True
+	for step in range(600):
+		edges = graph1.get_edge_list()
+		old_tree = set((x, y) for (x, y, w) in dynamic.get_edges())
+		kind = randrange(3)
+		if kind == 0 and len(edges) > 0:
+			u, v = edges[randrange(len(edges))]
+			added, removed = dynamic.delete_edge(u, v)
+		elif kind == 1 and len(edges) > 0:
+			u, v = edges[randrange(len(edges))]
+			added, removed = dynamic.set_edge_weight(u, v, randint(1, 12))
+		else:
+			u, v = randrange(80), randrange(80)
+			if u == v or graph1.has_edge(u, v):
+				continue
+			added, removed = dynamic.insert_edge(u, v, randint(1, 12))
+		new_tree = set((x, y) for (x, y, w) in dynamic.get_edges())
+		expected = kruskal(graph1)
+		if dynamic.get_total_weight() != get_total_weight(expected) or len(new_tree) != expected.get_card_E():
+			print("Not a minimum spanning forest after step", step)
+			all_equal = False
+		if new_tree != (old_tree - set((x, y) for (x, y, w) in removed)) | set((x, y) for (x, y, w) in added):
+			print("Wrong change report after step", step)
+			all_equal = False
+	print("Dynamic spanning forests are " + ("not " if not all_equal else "") + "minimum after every update")
+
+	# Seeding from prim on a connected graph, and detecting outside changes.
+	graph2 = generate_random_graph(60, 0.3, True, False, True, 1, 20)
+	dynamic = DynamicMST(graph2, prim(graph2, 0))
+	print("Seeded from prim: total weight", dynamic.get_total_weight(), "vs kruskal", get_total_weight(kruskal(graph2)))
+	if graph2.has_edge(0, 59):
+		graph2.delete_edge(0, 59)
+	else:
+		graph2.insert_edge(0, 59, 1)
+	try:
+		dynamic.insert_edge(1, 58, 1)
+		print("Outside change not detected")
+	except RuntimeError as e:
+		print("Outside change detected:", e)
+	print()
+
+	# Rolling closures of every backbone edge on a larger network: close, then reopen.
+	card_V = 3000
+	graph3 = generate_random_network(card_V, card_V, indexed=True)
+	closures = DynamicMST(graph3).get_edges()[:300]
+
+	start = time.perf_counter()
+	dynamic = DynamicMST(graph3)
+	dynamic_weights = []
+	for (u, v, w) in closures:
+		dynamic.delete_edge(u, v)
+		dynamic_weights.append(dynamic.get_total_weight())
+		dynamic.insert_edge(u, v, w)
+	dynamic_time = time.perf_counter() - start
+
+	start = time.perf_counter()
+	scratch_weights = []
+	for (u, v, w) in closures:
+		graph3.delete_edge(u, v)
+		scratch_weights.append(get_total_weight(kruskal(graph3)))
+		graph3.insert_edge(u, v, w)
+	scratch_time = time.perf_counter() - start
+
+	print(len(closures), "backbone closures on", card_V, "stations: dynamic", round(dynamic_time, 3),
+		  "s, kruskal from scratch", round(scratch_time, 3), "s, weights "
+		  + ("agree" if dynamic_weights == scratch_weights else "disagree"))
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# dynamic_sssp.py
+
+"""Single-source shortest paths maintained under edge updates.
+
+After an edge is deleted or made heavier, only the vertices in the subtree of
+the shortest-path tree below that edge can be farther from the source, so only
+they are searched again, starting from their best neighbors outside the subtree.
+After an edge is inserted or made lighter, only vertices whose distance drops
+can change, and a Dijkstra search started at the improved endpoint finds them.
+Either way, the work is proportional to the part of the tree that changes rather
+than to the whole graph (in the spirit of Ramalingam and Reps)."""
+
+from heapq import heappush, heappop
+from dijkstra import dijkstra, path_to
+
+INF = float('inf')
+
+
+class DynamicSSSP:
+
+	def __init__(self, G, s, d=None, pi=None):
+		"""Initialize from a graph and source, and optionally an existing shortest-path tree.
+
+		Arguments:
+		G -- an AdjacencyListGraph with nonnegative weights, changed only through this
+		structure once it is built (see AdjacencyListGraph.check_version)
+		s -- index of source vertex
+		d -- distances from s, as returned by dijkstra, or None to run dijkstra.
+		The list is copied.
+		pi -- predecessors matching d
+		"""
+		if d is None:
+			d, pi = dijkstra(G, s, queue="lazy")
+		card_V = G.get_card_V()
+		self.G = G
+		self.s = s
+		self.d = list(d)
+		self.pi = list(pi)
+		self.version = G.get_version()
+
+		# children[u] is the set of vertices whose predecessor is u.
+		self.children = [set() for _ in range(card_V)]
+		for v in range(card_V):
+			if self.pi[v] is not None:
+				self.children[self.pi[v]].add(v)
+
+		# Incoming edges of each vertex, needed to search a subtree again.  In an
+		# undirected graph they are the adjacency lists themselves.
+		if G.is_directed():
+			self.in_edges = [{} for _ in range(card_V)]
+			for u in range(card_V):
+				for edge in G.get_adj_list(u):
+					self.in_edges[edge.get_v()][u] = edge.get_weight()
+		else:
+			self.in_edges = None
+
+	def get_distances(self):
+		"""Return the list of distances from the source."""
+		return self.d
+
+	def get_predecessors(self):
+		"""Return the list of predecessors on shortest paths from the source."""
+		return self.pi
+
+	def distance(self, t):
+		"""Return the weight of a shortest path from the source to t."""
+		return self.d[t]
+
+	def path(self, t):
+		"""Return the list of vertices on a shortest path from the source to t, None if t is unreachable."""
+		return path_to(self.pi, self.s, t)
+
+	def delete_edge(self, u, v):
+		"""Delete edge (u, v) from the graph and repair the shortest paths.
+		Returns the list of vertices whose distance changed."""
+		self.G.check_version(self.version, "DynamicSSSP")
+		weight = self.G.find_edge(u, v).get_weight() if self.G.has_edge(u, v) else None
+		self.G.delete_edge(u, v)
+		if self.in_edges is not None:
+			self.in_edges[v].pop(u, None)
+		self.version = self.G.get_version()
+		if weight is None:
+			return []
+		return self.repair_after_increase(u, v)
+
+	def insert_edge(self, u, v, weight):
+		"""Insert edge (u, v) with the given weight into the graph and repair the
+		shortest paths.  Returns the list of vertices whose distance changed."""
+		self.G.check_version(self.version, "DynamicSSSP")
+		self.G.insert_edge(u, v, weight)
+		if self.in_edges is not None:
+			self.in_edges[v][u] = weight
+		self.version = self.G.get_version()
+		return self.repair_after_decrease(u, v, weight)
+
+	def set_edge_weight(self, u, v, weight):
+		"""Change the weight of edge (u, v) and repair the shortest paths.
+		Returns the list of vertices whose distance changed."""
+		self.G.check_version(self.version, "DynamicSSSP")
+		old_weight = self.G.find_edge(u, v).get_weight()
+		self.G.set_edge_weight(u, v, weight)
+		if self.in_edges is not None:
+			self.in_edges[v][u] = weight
+		self.version = self.G.get_version()
+		if weight < old_weight:
+			return self.repair_after_decrease(u, v, weight)
+		if weight > old_weight:
+			return self.repair_after_increase(u, v)
+		return []
+
+	def set_predecessor(self, v, u):
+		"""Make u the predecessor of v, keeping the children sets up to date."""
+		if self.pi[v] is not None:
+			self.children[self.pi[v]].discard(v)
+		self.pi[v] = u
+		if u is not None:
+			self.children[u].add(v)
+
+	def repair_after_increase(self, u, v):
+		"""Repair after edge (u, v) was deleted or made heavier.  Unless (u, v), or (v, u)
+		in an undirected graph, is a tree edge, no distance changes."""
+		if self.pi[v] == u:
+			root = v
+		elif not self.G.is_directed() and self.pi[u] == v:
+			root = u
+		else:
+			return []
+
+		# Every vertex of the subtree below root may be affected; nothing else is.
+		affected = [root]
+		in_subtree = {root}
+		i = 0
+		while i < len(affected):
+			for x in self.children[affected[i]]:
+				in_subtree.add(x)
+				affected.append(x)
+			i += 1
+		old_d = {x: self.d[x] for x in affected}
+
+		# Each affected vertex starts from its best incoming edge from outside the subtree.
+		queue = []
+		for x in affected:
+			best, best_u = INF, None
+			for y, weight in self.incoming(x):
+				if y not in in_subtree and self.d[y] + weight < best:
+					best, best_u = self.d[y] + weight, y
+			self.d[x] = best
+			self.set_predecessor(x, best_u)
+			if best < INF:
+				heappush(queue, (best, x))
+
+		# Dijkstra's algorithm confined to the subtree.
+		while queue:
+			d_x, x = heappop(queue)
+			if d_x > self.d[x]:  # stale entry
+				continue
+			for edge in self.G.get_adj_list(x):
+				z = edge.get_v()
+				d_z = d_x + edge.get_weight()
+				if z in in_subtree and d_z < self.d[z]:
+					self.d[z] = d_z
+					self.set_predecessor(z, x)
+					heappush(queue, (d_z, z))
+
+		return [x for x in affected if self.d[x] != old_d[x]]
+
+	def repair_after_decrease(self, u, v, weight):
+		"""Repair after edge (u, v) was inserted or made lighter, by a Dijkstra search
+		from whichever endpoint got closer to the source."""
+		queue = []
+		changed = {}
+		for (x, y) in [(u, v)] if self.G.is_directed() else [(u, v), (v, u)]:
+			if self.d[x] + weight < self.d[y]:
+				self.d[y] = self.d[x] + weight
+				self.set_predecessor(y, x)
+				changed[y] = True
+				heappush(queue, (self.d[y], y))
+
+		while queue:
+			d_x, x = heappop(queue)
+			if d_x > self.d[x]:  # stale entry
+				continue
+			for edge in self.G.get_adj_list(x):
+				z = edge.get_v()
+				d_z = d_x + edge.get_weight()
+				if d_z < self.d[z]:
+					self.d[z] = d_z
+					self.set_predecessor(z, x)
+					changed[z] = True
+					heappush(queue, (d_z, z))
+
+		return list(changed)
+
+	def incoming(self, x):
+		"""Return an iterable of (y, weight) pairs for the edges (y, x) into x."""
+		if self.in_edges is not None:
+			return self.in_edges[x].items()
+		return ((edge.get_v(), edge.get_weight()) for edge in self.G.get_adj_list(x))
+
+
+# Testing
+if __name__ == "__main__":
+
+	import time
+	from random import randint, randrange, seed
+	from generate_random_graph import generate_random_graph, generate_random_network
+
+	seed(13)
+
+	# Random updates in random order, checked against dijkstra from scratch.
+	for directed in [True, False]:
+		graph1 = generate_random_graph(120, 0.04, True, directed, True, 1, 15)
+		sssp = DynamicSSSP(graph1, 0)
+		all_equal = True
+		for step in range(400):
+			edges = graph1.get_edge_list()
+			old_d = list(sssp.get_distances())
+			kind = randrange(3)
+			if kind == 0 and len(edges) > 0:
+				u, v = edges[randrange(len(edges))]
+				changed = sssp.delete_edge(u, v)
+			elif kind == 1 and len(edges) > 0:
+				u, v = edges[randrange(len(edges))]
+				changed = sssp.set_edge_weight(u, v, randint(1, 15))
+			else:
+				u, v = randrange(120), randrange(120)
+				if u == v or graph1.has_edge(u, v):
+					continue
+				changed = sssp.insert_edge(u, v, randint(1, 15))
+			d, pi = dijkstra(graph1, 0)
+			reported = sorted(changed)
+			actual = [x for x in range(120) if d[x] != old_d[x]]
+			if d != sssp.get_distances() or reported != actual:
+				print("Mismatch after step", step)
+				all_equal = False
+			for t in range(120):
+				path = sssp.path(t)
+				if path is not None and sum(graph1.find_edge(path[i], path[i + 1]).get_weight()
+											for i in range(len(path) - 1)) != d[t]:
+					print("Bad path to", t, "after step", step)
+					all_equal = False
+		print(("Directed" if directed else "Undirected") + " dynamic distances and changed vertices are "
+			  + ("not " if not all_equal else "") + "equal to dijkstra")
+
+	# Changing the graph behind the structure's back is detected.
+	if graph1.has_edge(0, 119):
+		graph1.delete_edge(0, 119)
+	else:
+		graph1.insert_edge(0, 119, 1)
+	try:
+		sssp.delete_edge(0, 1)
+		print("Outside change not detected")
+	except RuntimeError as e:
+		print("Outside change detected:", e)
+	print()
+
+	# What-if closures on a task4b-style network: close each of 200 edges, then reopen it.
+	card_V = 5000
+	graph2 = generate_random_network(card_V, card_V // 2, indexed=True)
+	closures = graph2.get_edge_list()[::graph2.get_card_E() // 200][:200]
+
+	start = time.perf_counter()
+	sssp = DynamicSSSP(graph2, 0)
+	dynamic_changed = []
+	for u, v in closures:
+		weight = graph2.find_edge(u, v).get_weight()
+		dynamic_changed.append(len(sssp.delete_edge(u, v)))
+		sssp.insert_edge(u, v, weight)
+	dynamic_time = time.perf_counter() - start
+
+	start = time.perf_counter()
+	base_d, base_pi = dijkstra(graph2, 0, queue="lazy")
+	scratch_changed = []
+	for u, v in closures:
+		weight = graph2.find_edge(u, v).get_weight()
+		graph2.delete_edge(u, v)
+		d, pi = dijkstra(graph2, 0, queue="lazy")
+		scratch_changed.append(sum(1 for x in range(card_V) if d[x] != base_d[x]))
+		graph2.insert_edge(u, v, weight)
+	scratch_time = time.perf_counter() - start
+
+	print(len(closures), "closures on", card_V, "stations: dynamic", round(dynamic_time, 3), "s, from scratch",
+		  round(scratch_time, 3), "s, changed counts " + ("agree" if dynamic_changed == scratch_changed else "disagree"))
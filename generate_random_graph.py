@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# generate_random_graph.py
+
+# Introduction to Algorithms, Fourth edition
+# Tom Cormen
+
+#########################################################################
+#                                                                       #
+# Copyright 2022 Massachusetts Institute of Technology                  #
+#                                                                       #
+# Permission is hereby granted, free of charge, to any person obtaining #
+# a copy of this software and associated documentation files (the       #
+# "Software"), to deal in the Software without restriction, including   #
+# without limitation the rights to use, copy, modify, merge, publish,   #
+# distribute, sublicense, and/or sell copies of the Software, and to    #
+# permit persons to whom the Software is furnished to do so, subject to #
+# the following conditions:                                             #
+#                                                                       #
+# The above copyright notice and this permission notice shall be        #
+# included in all copies or substantial portions of the Software.       #
+#                                                                       #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,       #
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF    #
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND                 #
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS   #
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN    #
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN     #
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE      #
+# SOFTWARE.                                                             #
+#                                                                       #
+#########################################################################
+
+from random import randint, random, randrange
+from adjacency_list_graph import AdjacencyListGraph
+from adjacency_matrix_graph import AdjacencyMatrixGraph
+
+
+def generate_random_graph(card_V, edge_probability, by_adjacency_lists=True,
+                          directed=True, weighted=False, min_weight=0, max_weight=20):
+    """Generate and return a random graph.
+
+    Arguments:
+        card_V -- number of vertices
+        edge_probability -- probability that a given edge is present
+        by_adjacency_lists -- True if the graph is represented by adjacency lists,
+        False if by an adjacency matrix
+        directed -- True if the graph is directed, False if undirected
+        weighted -- True if the graph is weighted, False if unweighted
+        min_weight -- if weighted, the minimum weight of an edge
+        max_weight -- if weighted, the maximum weight of an edge
+
+    Returns:
+        A graph
+        """
+    constructor = AdjacencyListGraph if by_adjacency_lists else AdjacencyMatrixGraph
+    G = constructor(card_V, directed, weighted)
+
+    for u in range(card_V):
+        if directed:
+            min_v = 0
+        else:
+            min_v = u + 1
+
+        for v in range(min_v, card_V):
+            if random() <= edge_probability:  # add edge (u, v)
+                if weighted:
+                    weight = randint(min_weight, max_weight)  # random weight within range
+                else:
+                    weight = None
+                G.insert_edge(u, v, weight)  # guaranteed that edge (u, v) is not already present
+
+    return G
+
+
+def generate_random_network(card_V, extra_card_E, directed=False, min_weight=1, max_weight=10, indexed=False):
+    """Generate and return a random weighted network shaped like the ones in task2b.py:
+    each vertex after the first is joined to a random earlier vertex, so that the
+    network is connected, and then edges join random pairs of vertices.  Self-loops
+    are dropped, and parallel edges are merged as in AdjacencyListGraph.from_edges.
+
+    Arguments:
+        card_V -- number of vertices
+        extra_card_E -- number of random edges added to the spanning tree
+        directed -- True if the network is directed, False if undirected
+        min_weight -- the minimum weight of an edge
+        max_weight -- the maximum weight of an edge
+        indexed -- True to build the graph with an edge index, for fast lookups
+
+    Returns:
+        An AdjacencyListGraph
+        """
+    edges = [(randrange(v), v, randint(min_weight, max_weight)) for v in range(1, card_V)]
+    edges += [(randrange(card_V), randrange(card_V), randint(min_weight, max_weight)) for _ in range(extra_card_E)]
+    G, skipped, duplicates = AdjacencyListGraph.from_edges(card_V, [e for e in edges if e[0] != e[1]],
+                                                           directed, True, indexed=indexed)
+    return G
+
+
+def textbook_example():
+    """Return the weighted, directed example graph that the tests of dijkstra.py and
+    the other shortest-path modules start from.
+
+    Returns:
+        vertices -- list of vertex names, indexed by vertex number
+        G -- the graph, represented by adjacency lists
+        """
+    vertices = ['s', 't', 'x', 'y', 'z']
+    edges = [('s', 't', 10), ('s', 'y', 5), ('t', 'x', 1), ('t', 'y', 2), ('x', 'z', 4),
+             ('y', 't', 3), ('y', 'x', 9), ('y', 'z', 2), ('z', 's', 7), ('z', 'x', 6)]
+    G = AdjacencyListGraph(len(vertices), True, True)
+    for edge in edges:
+        G.insert_edge(vertices.index(edge[0]), vertices.index(edge[1]), edge[2])
+    return vertices, G
+
+
+def path_weight(G, path):
+    """Return the total weight of the edges along a path, given as a list of vertices,
+    to check the paths that shortest-path searches return."""
+    return sum(G.find_edge(path[i], path[i + 1]).get_weight() for i in range(len(path) - 1))
+
+
+# Testing
+if __name__ == "__main__":
+    graph1 = generate_random_graph(20, 0.12)
+    print(graph1)
+
+    graph2 = generate_random_graph(10, 0.15, False, False, False)
+    print(graph2)
+    print()
+
+    graph3 = generate_random_graph(18, 0.25, False, False, True, 3, 7)
+    print(graph3)
+
+    graph4 = generate_random_network(1000, 2000)
+    print(graph4.get_card_V(), "vertices,", graph4.get_card_E(), "edges")
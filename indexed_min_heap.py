@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# indexed_min_heap.py
+
+"""Min-priority queue specialized for integer handles 0, 1, ..., n-1, such as vertex numbers.
+
+Unlike MinHeapPriorityQueue, keys are stored inline in a list indexed by handle,
+positions in the heap are kept in a list instead of a dictionary, and no key
+function is called on comparisons."""
+
+
+class IndexedMinHeap:
+
+    def __init__(self, n):
+        """Initialize an empty min-heap that can hold the handles 0 to n-1.
+
+        Arguments:
+        n -- number of possible handles
+        """
+        self.heap = [0] * n            # handles in heap order
+        self.pos = [-1] * n            # pos[v] is the index of v in heap, -1 if v is not in the heap
+        self.key = [float('inf')] * n  # key[v] is the key of handle v
+        self.heap_size = 0
+
+    def get_size(self):
+        """Return the number of handles in the priority queue."""
+        return self.heap_size
+
+    def contains(self, v):
+        """Return True if handle v is in the priority queue, False otherwise."""
+        return self.pos[v] >= 0
+
+    def get_key(self, v):
+        """Return the key of handle v."""
+        return self.key[v]
+
+    def minimum(self):
+        """Return the handle with the minimum key."""
+        if self.heap_size <= 0:
+            raise RuntimeError("Heap underflow.")
+        return self.heap[0]
+
+    def insert(self, v, k):
+        """Insert handle v with key k."""
+        if self.pos[v] >= 0:
+            raise RuntimeError("Handle " + str(v) + " is already in the heap.")
+        self.key[v] = k
+        self.heap[self.heap_size] = v
+        self.pos[v] = self.heap_size
+        self.heap_size += 1
+        self.sift_up(self.heap_size - 1)
+
+    def extract_min(self):
+        """Return and delete the handle with the minimum key."""
+        top = self.minimum()
+        self.heap_size -= 1
+        self.pos[top] = -1
+        if self.heap_size > 0:
+            # Move the last handle to the root and restore the heap property.
+            last = self.heap[self.heap_size]
+            self.heap[0] = last
+            self.pos[last] = 0
+            self.sift_down(0)
+        return top
+
+    def decrease_key(self, v, k):
+        """Decrease the key of handle v to k.  Error if k is greater than v's current key."""
+        if k > self.key[v]:
+            raise RuntimeError("Error in decrease_key: new key " + str(k)
+                               + " is greater than current key " + str(self.key[v]))
+        self.key[v] = k
+        self.sift_up(self.pos[v])
+
+    def sift_up(self, i):
+        """Move the handle at index i toward the root until its parent's key is no greater."""
+        heap, pos, key = self.heap, self.pos, self.key
+        v = heap[i]
+        k = key[v]
+        # Slide parents down into the hole instead of swapping at each level.
+        while i > 0:
+            parent = (i - 1) // 2
+            p = heap[parent]
+            if not k < key[p]:
+                break
+            heap[i] = p
+            pos[p] = i
+            i = parent
+        heap[i] = v
+        pos[v] = i
+
+    def sift_down(self, i):
+        """Move the handle at index i away from the root until no child has a smaller key."""
+        heap, pos, key, size = self.heap, self.pos, self.key, self.heap_size
+        v = heap[i]
+        k = key[v]
+        while True:
+            child = 2*i + 1
+            if child >= size:
+                break
+            # Pick the child with the smaller key.
+            if child + 1 < size and key[heap[child + 1]] < key[heap[child]]:
+                child += 1
+            c = heap[child]
+            if not key[c] < k:
+                break
+            heap[i] = c
+            pos[c] = i
+            i = child
+        heap[i] = v
+        pos[v] = i
+
+    def is_heap(self):
+        """Verify that the array represents a heap and that the positions are consistent."""
+        for i in range(self.heap_size):
+            if self.pos[self.heap[i]] != i:
+                return False
+            if i > 0 and self.key[self.heap[i]] < self.key[self.heap[(i - 1) // 2]]:
+                return False
+        return True
+
+    def __str__(self):
+        """Return the heap as a list of (handle, key) pairs."""
+        return ", ".join(str((v, self.key[v])) for v in self.heap[:self.heap_size])
+
+
+# Testing
+if __name__ == "__main__":
+
+    import random
+
+    keys = [random.randint(0, 100) for _ in range(20)]
+    pq1 = IndexedMinHeap(len(keys))
+    for v in range(len(keys)):
+        pq1.insert(v, keys[v])
+    print(pq1)
+    print(pq1.is_heap())
+
+    # Decrease the last key to -100, which should be the minimum.
+    pq1.decrease_key(len(keys) - 1, -100)
+    print(pq1.is_heap())
+    print(pq1.extract_min() == len(keys) - 1)
+
+    # Check repeated calls to extract_min.
+    extracted_keys = []
+    while pq1.get_size() > 0:
+        extracted_keys.append(pq1.get_key(pq1.extract_min()))
+    print(extracted_keys)
+    print(extracted_keys == sorted(extracted_keys))
+
+    # Errors.
+    pq2 = IndexedMinHeap(3)
+    pq2.insert(1, 5)
+    for bad in [lambda: pq2.decrease_key(1, 6), lambda: pq2.insert(1, 0)]:
+        try:
+            bad()
+        except RuntimeError as e:
+            print(e)
+    pq2.extract_min()
+    try:
+        pq2.extract_min()
+    except RuntimeError as e:
+        print(e)
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# landmarks.py
+
+"""Landmark (ALT) preprocessing for shortest-path lower bounds.
+
+For a landmark l, the triangle inequality gives
+	delta(v, t) >= delta(l, t) - delta(l, v)   and   delta(v, t) >= delta(v, l) - delta(t, l),
+so distance tables from and to a few landmarks give a lower bound on every
+shortest-path distance, usable as an A* heuristic."""
+
+import struct
+from array import array
+from dijkstra import dijkstra
+
+INF = float('inf')
+MAGIC = b'ALT1'
+HEADER = struct.Struct('<4sqq?')  # magic, card_V, number of landmarks, directed
+
+
+class Landmarks:
+
+	def __init__(self, card_V, landmarks, from_table, to_table=None):
+		"""Initialize from already-computed distance tables.  Normally called by
+		build or load rather than directly.
+
+		Arguments:
+		card_V -- number of vertices in the graph
+		landmarks -- list of landmark vertices
+		from_table -- array of len(landmarks) * card_V distances, where
+		from_table[i * card_V + v] is the distance from landmark i to v
+		to_table -- same layout for the distances from v to landmark i, or None
+		if the graph is undirected and the two tables are the same
+		"""
+		self.card_V = card_V
+		self.landmarks = landmarks
+		self.from_table = from_table
+		self.to_table = to_table
+
+	@classmethod
+	def build(cls, G, k, method="farthest", G_reverse=None):
+		"""Choose k landmarks in G and compute the distance tables.
+
+		Arguments:
+		G -- a weighted graph with nonnegative weights
+		k -- number of landmarks
+		method -- "farthest" to choose each landmark as the vertex farthest from those
+		chosen so far, or "degree" to choose the k vertices of highest degree
+		G_reverse -- the transpose of G, used for the distances to landmarks in a
+		directed graph.  Computed if omitted.
+		"""
+		card_V = G.get_card_V()
+		k = min(k, card_V)
+		directed = G.is_directed()
+		if directed and G_reverse is None:
+			G_reverse = G.transpose()
+
+		landmarks = []
+		from_table = array('d')
+		to_table = array('d') if directed else None
+
+		if method == "degree":
+			degree = [sum(1 for _ in G.get_adj_list(u)) for u in range(card_V)]
+			candidates = sorted(range(card_V), key=lambda u: -degree[u])[:k]
+		elif method != "farthest":
+			raise RuntimeError("Unknown landmark selection method " + str(method) + ".")
+
+		# For farthest-point selection, nearest[v] is the distance from v to its nearest landmark.
+		nearest = [INF] * card_V
+		next_landmark = 0
+		for i in range(k):
+			if method == "degree":
+				next_landmark = candidates[i]
+			landmarks.append(next_landmark)
+			d, pi = dijkstra(G, next_landmark, queue="lazy")
+			from_table.extend(d)
+			if directed:
+				d_to, pi_to = dijkstra(G_reverse, next_landmark, queue="lazy")
+				to_table.extend(d_to)
+
+			if method == "farthest":
+				# The next landmark is the reachable vertex farthest from all landmarks so far.
+				best = -1
+				for v in range(card_V):
+					if d[v] < nearest[v]:
+						nearest[v] = d[v]
+					if nearest[v] != INF and nearest[v] > best:
+						best = nearest[v]
+						next_landmark = v
+				if best <= 0:
+					# Everything reachable is covered; start again in an unreached part of the graph.
+					unreached = [v for v in range(card_V) if nearest[v] == INF]
+					if len(unreached) == 0:
+						break
+					next_landmark = unreached[0]
+
+		return cls(card_V, landmarks, from_table, to_table)
+
+	def get_landmarks(self):
+		"""Return the list of landmark vertices."""
+		return self.landmarks
+
+	def lower_bound(self, v, t):
+		"""Return a lower bound on the weight of a shortest path from v to t.  Has the
+		signature of an A* heuristic, so that astar(G, s, t, landmarks.lower_bound) works."""
+		card_V = self.card_V
+		from_table = self.from_table
+		to_table = self.to_table if self.to_table is not None else from_table
+		bound = 0
+		for i in range(0, len(self.landmarks) * card_V, card_V):
+			# Terms with an infinite distance say nothing, so they are skipped.
+			d_lt = from_table[i + t]
+			d_lv = from_table[i + v]
+			if d_lt != INF and d_lv != INF and d_lt - d_lv > bound:
+				bound = d_lt - d_lv
+			d_vl = to_table[i + v]
+			d_tl = to_table[i + t]
+			if d_vl != INF and d_tl != INF and d_vl - d_tl > bound:
+				bound = d_vl - d_tl
+		return bound
+
+	def save(self, path):
+		"""Write the landmarks and distance tables to a binary file."""
+		with open(path, 'wb') as f:
+			f.write(HEADER.pack(MAGIC, self.card_V, len(self.landmarks), self.to_table is not None))
+			array('q', self.landmarks).tofile(f)
+			self.from_table.tofile(f)
+			if self.to_table is not None:
+				self.to_table.tofile(f)
+
+	@classmethod
+	def load(cls, path):
+		"""Read landmarks and distance tables written by save."""
+		with open(path, 'rb') as f:
+			magic, card_V, k, directed = HEADER.unpack(f.read(HEADER.size))
+			if magic != MAGIC:
+				raise RuntimeError(str(path) + " is not a landmark file.")
+			landmarks = array('q')
+			landmarks.fromfile(f, k)
+			from_table = array('d')
+			from_table.fromfile(f, k * card_V)
+			to_table = None
+			if directed:
+				to_table = array('d')
+				to_table.fromfile(f, k * card_V)
+		return cls(card_V, list(landmarks), from_table, to_table)
+
+
+# Testing
+if __name__ == "__main__":
+
+	import os
+	import tempfile
+	import time
+	from random import randrange, seed
+	from generate_random_graph import generate_random_graph, generate_random_network
+	from astar import astar
+	from dijkstra import shortest_path
+
+	seed(3)
+
+	# Lower bounds never exceed true distances, directed and undirected.
+	for directed in [True, False]:
+		graph1 = generate_random_graph(150, 0.04, True, directed, True, 1, 15)
+		for method in ["farthest", "degree"]:
+			alt = Landmarks.build(graph1, 4, method)
+			valid = True
+			for v in range(graph1.get_card_V()):
+				d, pi = dijkstra(graph1, v)
+				for t in range(graph1.get_card_V()):
+					if alt.lower_bound(v, t) > d[t]:
+						valid = False
+			print(("directed" if directed else "undirected"), method, alt.get_landmarks(),
+				  "lower bounds valid:", valid)
+
+	# Save and load round trip.
+	path = os.path.join(tempfile.mkdtemp(), "landmarks.alt")
+	alt.save(path)
+	alt2 = Landmarks.load(path)
+	print("round trip equal:", alt2.get_landmarks() == alt.get_landmarks()
+		  and alt2.from_table == alt.from_table and alt2.to_table == alt.to_table)
+	print()
+
+	# Query cost with landmark lower bounds on a task2b-style network.
+	card_V = 20000
+	graph2 = generate_random_network(card_V, 2 * card_V)
+	start = time.perf_counter()
+	alt = Landmarks.build(graph2, 8)
+	print("Preprocessing 8 landmarks on", card_V, "stations:", round(time.perf_counter() - start, 2), "s")
+	queries = [(randrange(card_V), randrange(card_V)) for _ in range(100)]
+	for name, search in [("Dijkstra", lambda s, t, f: shortest_path(graph2, s, t, f)),
+						 ("ALT", lambda s, t, f: astar(graph2, s, t, alt.lower_bound, f))]:
+		expanded = []
+		start = time.perf_counter()
+		results = [search(s, t, expanded.append)[0] for s, t in queries]
+		elapsed = (time.perf_counter() - start) / len(queries) * 1000
+		print(name + ": " + str(round(elapsed, 3)) + " ms per query, "
+			  + str(len(expanded) / len(queries)) + " vertices expanded per query")
+		if name == "Dijkstra":
+			expected = results
+		elif results != expected:
+			print("Mismatch between Dijkstra and ALT distances")
@@ -82,7 +82,11 @@ def dfs(G, start_dfs_tree=None, discover_func=None, finish_func=None, order=None
 
 def dfs_visit(G, u, discover_func, finish_func):
 	"""Perform depth-first search on a graph represented by adjacency lists, starting
-	from a given vertex.
+	from a given vertex.  Instead of calling itself for each newly discovered vertex,
+	the search keeps an explicit stack holding, for each gray vertex, the iterator
+	over its adjacency list, so that deep graphs do not hit the recursion limit.
+	Vertices are discovered and finished in the same order, and at the same times,
+	as by the recursive procedure in the textbook.
 
 	Arguments:
 	G -- a graph, represented by adjacency lists.
@@ -98,19 +102,28 @@ def dfs_visit(G, u, discover_func, finish_func):
 	time += 1  # white vertex u has just been discovered
 	d[u] = time
 	color[u] = GRAY
-
-	for edge in G.get_adj_list(u):  # explore each edge (u, v)
-		v = edge.get_v()
-		if color[v] == WHITE:
-			if discover_func is not None:
-				discover_func(v)  # do something with vertex v upon discovering it
-			pi[v] = u
-			dfs_visit(G, v, discover_func, finish_func)
-	time += 1
-	f[u] = time
-	color[u] = BLACK  # black u; it is finished
-	if finish_func is not None:
-		finish_func(u)  # do something with vertex v upon finishing it
+	stack = [(u, iter(G.get_adj_list(u)))]  # iterators resume where they stopped, even over a list
+
+	while len(stack) > 0:
+		x, edges = stack[-1]
+		for edge in edges:  # explore the remaining edges (x, v), resuming where x left off
+			v = edge.get_v()
+			if color[v] == WHITE:
+				if discover_func is not None:
+					discover_func(v)  # do something with vertex v upon discovering it
+				pi[v] = x
+				time += 1  # white vertex v has just been discovered
+				d[v] = time
+				color[v] = GRAY
+				stack.append((v, iter(G.get_adj_list(v))))  # search from v before going on with x
+				break
+		else:  # every edge leaving x has been explored
+			stack.pop()
+			time += 1
+			f[x] = time
+			color[x] = BLACK  # black x; it is finished
+			if finish_func is not None:
+				finish_func(x)  # do something with vertex x upon finishing it
 
 
 # Testing
@@ -30,10 +30,13 @@
 #                                                                       #
 #########################################################################
 
+import random
+import numpy as np
 from merge_sort import merge_sort
 from adjacency_list_graph import AdjacencyListGraph
-from disjoint_set_forest import make_set, find_set, union
+from disjoint_set_forest import make_set, find_set, union, DisjointSetForest
 from min_heap_priority_queue import MinHeapPriorityQueue
+from indexed_min_heap import IndexedMinHeap
 
 
 class KruskalEdge:
@@ -66,10 +69,20 @@ class KruskalEdge:
         return "(" + str(self.u) + ", " + str(self.v) + "), weight: " + str(self.weight)
 
 
-def kruskal(G):
-    """ Return the minimum spanning tree of a weighted, undirected graph G using Kruskal's algorithm."""
+def kruskal(G, mode="textbook"):
+    """ Return the minimum spanning tree of a weighted, undirected graph G using Kruskal's algorithm.
+
+    Arguments:
+    G -- an undirected graph, represented by adjacency lists
+    mode -- "textbook" for KruskalEdge objects sorted by merge_sort and a forest of
+    ForestNode objects, or "fast" for kruskal_fast, which gives the same tree
+    """
     if G.is_directed():
         raise RuntimeError("Graph should be undirected.")
+    if mode == "fast":
+        return kruskal_fast(G)
+    if mode != "textbook":
+        raise RuntimeError("Unknown Kruskal mode " + str(mode) + ".")
 
     card_V = G.get_card_V()
     # Initialize an undirected, weighted, minimum spanning tree.
@@ -100,12 +113,194 @@ def kruskal(G):
     return mst
 
 
-def prim(G, r):
+def kruskal_fast(G):
+    """Kruskal's algorithm on parallel lists of edge endpoints and weights.  The edges
+    are ordered by sort_edges_by_weight instead of merge_sort, and the disjoint-set
+    forest is an array-backed DisjointSetForest instead of ForestNode objects.
+    Edges are examined in the same order as by kruskal (both sorts are stable), so
+    the same edges go into the tree, in the same order."""
+    card_V = G.get_card_V()
+    us, vs, weights = undirected_edge_lists(G)
+
+    forest = DisjointSetForest(card_V)
+    tree_edges = []
+    for i in sort_edges_by_weight(weights):
+        if forest.union(us[i], vs[i]):  # the endpoints were in different trees, now connected
+            tree_edges.append((us[i], vs[i], weights[i]))
+            if len(tree_edges) == card_V - 1:  # spanning tree complete
+                break
+
+    mst, skipped, duplicates = AdjacencyListGraph.from_edges(card_V, tree_edges, False, True)
+    return mst
+
+
+def filter_kruskal(G, threshold=1024, rng=None):
+    """Return a minimum spanning tree by Filter-Kruskal (Osipov, Sanders, and Singler).
+    Instead of sorting every edge, split the edges around a random pivot weight,
+    find the tree edges among the lighter ones first, and then filter out the
+    heavier edges whose endpoints are already connected before going on with them.
+    In a dense graph most heavy edges are filtered out and never sorted.
+
+    Arguments:
+    G -- an undirected graph, represented by adjacency lists
+    threshold -- edge lists shorter than this are sorted and scanned as in kruskal_fast
+    rng -- random.Random instance for choosing pivots, or None for a fresh one
+    seeded with 0.  The global random module is left alone, so computing a tree
+    does not disturb seeded experiments.
+    """
+    if rng is None:
+        rng = random.Random(0)
+    card_V = G.get_card_V()
+    us, vs, weights = undirected_edge_lists(G)
+    forest = DisjointSetForest(card_V)
+    tree_edges = []
+
+    # Stack of (edge positions, whether to filter them first, whether they all have
+    # the same weight); the lightest group is on top.
+    stack = [(list(range(len(weights))), False, False)]
+    while len(stack) > 0 and len(tree_edges) < card_V - 1:
+        edges, needs_filter, same_weight = stack.pop()
+        if needs_filter:
+            edges = [i for i in edges if not forest.same_set(us[i], vs[i])]
+        if len(edges) == 0:
+            continue
+
+        if same_weight or len(edges) < threshold:
+            # Scan as Kruskal's algorithm does, sorting first unless the weights are all equal.
+            if not same_weight:
+                edge_weights = [weights[i] for i in edges]
+                edges = [edges[j] for j in sort_edges_by_weight(edge_weights)]
+            for i in edges:
+                if forest.union(us[i], vs[i]):
+                    tree_edges.append((us[i], vs[i], weights[i]))
+            continue
+
+        # Split into lighter, equal, and heavier edges than the pivot.  The equal
+        # edges need no sorting, so every split makes progress even with many ties.
+        pivot = weights[rng.choice(edges)]
+        lighter = [i for i in edges if weights[i] < pivot]
+        equal = [i for i in edges if weights[i] == pivot]
+        heavier = [i for i in edges if weights[i] > pivot]
+        stack.append((heavier, True, False))
+        stack.append((equal, True, True))
+        stack.append((lighter, False, False))
+
+    mst, skipped, duplicates = AdjacencyListGraph.from_edges(card_V, tree_edges, False, True)
+    return mst
+
+
+def boruvka(G):
+    """Return a minimum spanning tree by Boruvka's algorithm.  Each round finds, for
+    every component of the forest so far, the lightest edge leaving it, and adds all
+    of those edges at once, at least halving the number of components.  The rounds
+    look at every remaining edge independently, so they parallelize well.  Ties
+    between equal weights are broken by edge position, so that the edges chosen in
+    a round cannot form a cycle."""
+    card_V = G.get_card_V()
+    us, vs, weights = undirected_edge_lists(G)
+    forest = DisjointSetForest(card_V)
+    tree_edges = []
+
+    edges = list(range(len(weights)))
+    while len(edges) > 0:
+        # Lightest edge leaving each component, compared by (weight, position).
+        cheapest = {}
+        remaining = []
+        for i in edges:
+            x = forest.find_set(us[i])
+            y = forest.find_set(vs[i])
+            if x == y:
+                continue  # inside a component now, so never needed again
+            remaining.append(i)
+            for root in (x, y):
+                j = cheapest.get(root)
+                if j is None or weights[i] < weights[j] or (weights[i] == weights[j] and i < j):
+                    cheapest[root] = i
+
+        # Contract: add every chosen edge, once, joining the components.
+        for i in cheapest.values():
+            if forest.union(us[i], vs[i]):
+                tree_edges.append((us[i], vs[i], weights[i]))
+        edges = remaining
+
+    mst, skipped, duplicates = AdjacencyListGraph.from_edges(card_V, tree_edges, False, True)
+    return mst
+
+
+def minimum_spanning_tree(G, engine="kruskal"):
+    """Return a minimum spanning tree of G computed by the named engine.
+
+    Arguments:
+    G -- an undirected graph, represented by adjacency lists
+    engine -- "kruskal" (textbook), "kruskal_fast", "filter_kruskal", "boruvka",
+    "parallel_boruvka" (one worker process per CPU), "prim" (from vertex 0, with
+    MinHeapPriorityQueue), or "prim_indexed" (with IndexedMinHeap).  The Kruskal
+    and Boruvka engines return a spanning forest of a disconnected graph; the Prim
+    engines span only the component of vertex 0.  All engines give trees of the
+    same total weight, though with equal weights they may choose different edges.
+    """
+    if G.is_directed():
+        raise RuntimeError("Graph should be undirected.")
+    if engine == "kruskal":
+        return kruskal(G)
+    if engine == "kruskal_fast":
+        return kruskal_fast(G)
+    if engine == "filter_kruskal":
+        return filter_kruskal(G)
+    if engine == "boruvka":
+        return boruvka(G)
+    if engine == "parallel_boruvka":
+        from parallel_boruvka import parallel_boruvka  # imports this module
+        return parallel_boruvka(G)
+    if engine == "prim":
+        return prim(G, 0)
+    if engine == "prim_indexed":
+        return prim(G, 0, queue="indexed")
+    raise RuntimeError("Unknown minimum spanning tree engine " + str(engine) + ".")
+
+
+def undirected_edge_lists(G):
+    """Return parallel lists us, vs, and weights holding each edge (u, v) of an
+    undirected graph once, with u < v, in adjacency-list order."""
+    if G.is_directed():
+        raise RuntimeError("Graph should be undirected.")
+    us = []
+    vs = []
+    weights = []
+    for u in range(G.get_card_V()):
+        for edge in G.get_adj_list(u):
+            v = edge.get_v()
+            if u < v:  # append edge only once
+                us.append(u)
+                vs.append(v)
+                weights.append(edge.get_weight())
+    return us, vs, weights
+
+
+def sort_edges_by_weight(weights):
+    """Return the list of edge positions in nondecreasing order of weight, keeping
+    edges of equal weight in their original order.  Integer weights spanning fewer
+    than 2^16 values are sorted by NumPy's radix sort; other integers by NumPy's
+    stable sort; other weights by Python's built-in (stable) sort."""
+    if len(weights) == 0:
+        return []
+    if all(isinstance(weight, (int, np.integer)) for weight in weights):
+        keys = np.array(weights, dtype=np.int64)
+        low = keys.min()
+        if keys.max() - low < 2 ** 16:
+            keys = (keys - low).astype(np.uint16)  # NumPy sorts 16-bit integers by radix sort
+        return np.argsort(keys, kind='stable').tolist()
+    return sorted(range(len(weights)), key=weights.__getitem__)
+
+
+def prim(G, r, queue="min_heap"):
     """ Return the minimum spanning tree of a weighted, undirected graph G using Prim's algorithm.
 
     Arguments:
     G -- an undirected graph, represented by adjacency lists
     r -- root vertex to start from
+    queue -- priority queue to use: "min_heap" for MinHeapPriorityQueue with a
+    key function, or "indexed" for IndexedMinHeap keyed by vertex number
     """
     # Initialize keys and predecessors.
     card_V = G.get_card_V()
@@ -115,9 +310,18 @@ def prim(G, r):
     key[r] = 0  # root r has key 0
 
     # Initialize the min-priority queue of vertices.
-    queue = MinHeapPriorityQueue(lambda u: key[u])
-    for u in range(card_V):
-        queue.insert(u)
+    if queue == "min_heap":
+        queue = MinHeapPriorityQueue(lambda u: key[u])
+        for u in range(card_V):
+            queue.insert(u)
+    elif queue == "indexed":
+        queue = IndexedMinHeap(card_V)
+        queue.insert(r, 0)
+        for u in range(card_V):
+            if u != r:
+                queue.insert(u, key[u])
+    else:
+        raise RuntimeError("Unknown priority queue " + str(queue) + ".")
 
     while queue.get_size() > 0:
         u = queue.extract_min()  # add u to the tree
@@ -203,3 +407,45 @@ if __name__ == "__main__":
     prim_weight2 = get_total_weight(prim2)
     print("Prim weight =", prim_weight2)
     print(prim_weight2 == kruskal_weight2)
+    prim3 = prim(graph2, 0, queue="indexed")
+    print("Prim weight with indexed heap =", get_total_weight(prim3))
+    print(get_total_weight(prim3) == kruskal_weight2)
+
+    # The fast mode builds the same tree as the textbook mode.
+    import time
+    random.seed(21)
+    print()
+    for weight_range in [(1, 10), (1, 10 ** 9), None]:
+        card_V = 3000
+        edges = [(random.randrange(v), v) for v in range(1, card_V)]
+        edges += [(random.randrange(card_V), random.randrange(card_V)) for _ in range(3 * card_V)]
+        weighted_edges = [(u, v, random.randint(*weight_range) if weight_range else random.random() * 10)
+                          for (u, v) in edges if u != v]
+        graph3, skipped, duplicates = AdjacencyListGraph.from_edges(card_V, weighted_edges, False, True)
+        start = time.perf_counter()
+        textbook = kruskal(graph3)
+        textbook_time = time.perf_counter() - start
+        start = time.perf_counter()
+        fast = kruskal(graph3, mode="fast")
+        fast_time = time.perf_counter() - start
+        print("Weights " + (str(weight_range) if weight_range else "real") + ": textbook "
+              + str(round(textbook_time * 1000, 1)) + " ms, fast " + str(round(fast_time * 1000, 1)) + " ms, same tree: "
+              + str(str(textbook) == str(fast)))
+
+    # Every engine gives the same total weight, on sparse and dense graphs.
+    print()
+    # The last graph has so many equal weights that Filter-Kruskal's pivots hit large ties.
+    for card_V, extra_edges, max_weight in [(2000, 2000, 100), (600, 60000, 100), (600, 60000, 3)]:
+        edges = [(random.randrange(v), v) for v in range(1, card_V)]
+        edges += [(random.randrange(card_V), random.randrange(card_V)) for _ in range(extra_edges)]
+        graph4, skipped, duplicates = AdjacencyListGraph.from_edges(
+            card_V, [(u, v, random.randint(1, max_weight)) for (u, v) in edges if u != v], False, True)
+        weights = []
+        for engine in ["kruskal", "kruskal_fast", "filter_kruskal", "boruvka", "prim", "prim_indexed"]:
+            start = time.perf_counter()
+            tree = minimum_spanning_tree(graph4, engine)
+            elapsed = time.perf_counter() - start
+            weights.append(get_total_weight(tree))
+            print(card_V, "vertices,", graph4.get_card_E(), "edges,", engine + ":", weights[-1], "weight,",
+                  tree.get_card_E(), "edges,", round(elapsed * 1000, 1), "ms")
+        print("All engines agree:", len(set(weights)) == 1)
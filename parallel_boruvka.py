@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# parallel_boruvka.py
+
+"""Boruvka's minimum spanning tree algorithm spread over worker processes.
+
+The edges are copied once into NumPy arrays in shared memory, sorted by their
+lower endpoint, and each worker is given the edges of a contiguous range of
+vertices.  A shared array labels every vertex with its component.  In each
+round, every worker finds, for each component, the lightest edge in its range
+leaving that component; the main process keeps the lightest of those per
+component, joins the components with a DisjointSetForest, and writes the new
+labels back to shared memory for the next round.  Only small arrays of
+(component, edge) pairs pass between processes, and the number of components
+at least halves every round."""
+
+import os
+from numbers import Integral
+import numpy as np
+from multiprocessing import Pool, shared_memory
+from adjacency_list_graph import AdjacencyListGraph
+from disjoint_set_forest import DisjointSetForest
+from mst import undirected_edge_lists
+
+# Shared-memory blocks and the arrays over them, attached in each worker by init_worker.
+worker_blocks = None
+worker_arrays = None
+
+
+def parallel_boruvka(G, processes=None):
+	"""Return a minimum spanning tree (a spanning forest if G is disconnected) by
+	Boruvka's algorithm, with each round's search for cheapest edges split among
+	worker processes.  Ties between equal weights are broken by edge position, as
+	in boruvka, so the result has the same total weight as every other engine.
+
+	Arguments:
+	G -- an undirected graph, represented by adjacency lists
+	processes -- number of worker processes, None for one per CPU.  With 1,
+	everything runs in this process.
+	"""
+	card_V = G.get_card_V()
+	us, vs, weights = undirected_edge_lists(G)
+	forest = DisjointSetForest(card_V)
+	tree_edges = []
+	if len(weights) == 0:
+		mst, skipped, duplicates = AdjacencyListGraph.from_edges(card_V, tree_edges, False, True)
+		return mst
+	if processes is None:
+		processes = os.cpu_count() or 1
+	processes = max(1, min(processes, card_V))
+
+	# Integer weights stay exact; anything else is compared as floating point.
+	weight_dtype = np.int64 if all(isinstance(w, Integral) for w in weights) else np.float64
+	arrays = {"us": np.array(us, dtype=np.int32), "vs": np.array(vs, dtype=np.int32),
+			  "weights": np.array(weights, dtype=weight_dtype), "labels": np.arange(card_V, dtype=np.int32)}
+
+	# The edges come out in order of lower endpoint, so a range of vertices owns a
+	# contiguous slice of the edges.
+	vertex_bounds = [card_V * i // processes for i in range(processes + 1)]
+	edge_bounds = np.searchsorted(arrays["us"], vertex_bounds).tolist()
+	ranges = [(edge_bounds[i], edge_bounds[i + 1]) for i in range(processes) if edge_bounds[i] < edge_bounds[i + 1]]
+
+	blocks = {}
+	try:
+		for name, values in arrays.items():
+			blocks[name] = shared_memory.SharedMemory(create=True, size=max(1, values.nbytes))
+			shared = np.ndarray(values.shape, dtype=values.dtype, buffer=blocks[name].buf)
+			shared[:] = values
+		spec = {name: (blocks[name].name, values.shape, values.dtype.str) for name, values in arrays.items()}
+		labels = np.ndarray(card_V, dtype=np.int32, buffer=blocks["labels"].buf)
+
+		if len(ranges) == 1:
+			init_worker(spec)
+			run_rounds(forest, tree_edges, labels, us, vs, weights, lambda: [cheapest_edges(*r) for r in ranges])
+		else:
+			with Pool(len(ranges), initializer=init_worker, initargs=(spec,)) as pool:
+				run_rounds(forest, tree_edges, labels, us, vs, weights, lambda: pool.starmap(cheapest_edges, ranges))
+		del labels  # release the view before the block is closed
+	finally:
+		release_worker()
+		for block in blocks.values():
+			block.close()
+			block.unlink()
+
+	mst, skipped, duplicates = AdjacencyListGraph.from_edges(card_V, tree_edges, False, True)
+	return mst
+
+
+def run_rounds(forest, tree_edges, labels, us, vs, weights, find_cheapest):
+	"""Run Boruvka rounds until no edge leaves any component.  find_cheapest returns
+	one (components, edges, edge weights) triple per range of edges."""
+	while True:
+		results = find_cheapest()
+		components = np.concatenate([result[0] for result in results])
+		if components.size == 0:
+			return
+		edges = np.concatenate([result[1] for result in results])
+		edge_weights = np.concatenate([result[2] for result in results])
+
+		# Merge: the lightest candidate of each component over all ranges.
+		order = np.lexsort((edges, edge_weights, components))
+		components = components[order]
+		first = np.flatnonzero(np.r_[True, components[1:] != components[:-1]])
+		chosen = np.unique(edges[order][first])
+
+		# Contract, joining components through their labels (each a vertex of the component).
+		for i in chosen.tolist():
+			if forest.union(int(labels[us[i]]), int(labels[vs[i]])):
+				tree_edges.append((us[i], vs[i], weights[i]))
+
+		# Relabel every vertex with the root of its component's new set.
+		old_labels = np.unique(components)
+		root_of = np.arange(len(labels), dtype=np.int32)
+		root_of[old_labels] = [forest.find_set(c) for c in old_labels.tolist()]
+		labels[:] = root_of[labels]
+
+
+def init_worker(spec):
+	"""Attach to the shared edge and label arrays in this process."""
+	global worker_blocks, worker_arrays
+	worker_blocks = {}
+	worker_arrays = {}
+	for name, (block_name, shape, dtype) in spec.items():
+		worker_blocks[name] = shared_memory.SharedMemory(name=block_name)
+		worker_arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=worker_blocks[name].buf)
+
+
+def release_worker():
+	"""Drop this process's views of the shared arrays."""
+	global worker_blocks, worker_arrays
+	if worker_blocks is not None:
+		worker_arrays = None
+		for block in worker_blocks.values():
+			block.close()
+	worker_blocks = None
+
+
+def cheapest_edges(lo, hi):
+	"""Find, for each component touched by edges lo..hi-1, the lightest of those edges
+	leaving it, comparing by (weight, position).
+
+	Returns:
+	components -- NumPy array of component labels
+	edges -- positions of their cheapest edges
+	edge_weights -- weights of those edges
+	"""
+	labels = worker_arrays["labels"]
+	label_u = labels[worker_arrays["us"][lo:hi]]
+	label_v = labels[worker_arrays["vs"][lo:hi]]
+	crossing = np.flatnonzero(label_u != label_v)
+	edges = crossing + lo
+	edge_weights = worker_arrays["weights"][edges]
+
+	# Each crossing edge is a candidate for both of its components.
+	components = np.concatenate((label_u[crossing], label_v[crossing]))
+	edges = np.concatenate((edges, edges))
+	edge_weights = np.concatenate((edge_weights, edge_weights))
+	order = np.lexsort((edges, edge_weights, components))
+	components = components[order]
+	first = np.flatnonzero(np.r_[True, components[1:] != components[:-1]]) if components.size > 0 \
+		else np.zeros(0, dtype=np.int64)
+	return components[first], edges[order][first], edge_weights[order][first]
+
+
+# Testing
+if __name__ == "__main__":
+
+	import time
+	from random import randint, randrange, seed
+	from generate_random_graph import generate_random_network
+	from mst import boruvka, kruskal_fast, get_total_weight
+
+	seed(24)
+
+	# Same total weight as kruskal, with ties, floating-point weights, and disconnected graphs.
+	all_equal = True
+	for trial in range(12):
+		card_V = randint(1, 300)
+		edges = [(randrange(card_V), randrange(card_V)) for _ in range(randint(0, 3 * card_V))]
+		if trial % 3 == 0:
+			weighted = [(u, v, randint(1, 4)) for (u, v) in edges if u != v]
+		elif trial % 3 == 1:
+			weighted = [(u, v, randint(1, 1000) / 7) for (u, v) in edges if u != v]
+		else:
+			weighted = [(u, v, randint(-50, 50)) for (u, v) in edges if u != v]
+		graph1, skipped, duplicates = AdjacencyListGraph.from_edges(card_V, weighted, False, True)
+		expected = kruskal_fast(graph1)
+		for processes in [1, 3]:
+			tree = parallel_boruvka(graph1, processes)
+			if abs(get_total_weight(tree) - get_total_weight(expected)) > 1e-9 \
+					or tree.get_card_E() != expected.get_card_E():
+				print("Mismatch on trial", trial, "with", processes, "process(es)")
+				all_equal = False
+	print("Parallel Boruvka trees are " + ("not " if not all_equal else "") + "equal in weight to kruskal_fast")
+
+	# NumPy integer weights, as from_edges stores them from a 2-D integer array, are
+	# compared exactly: as floating point, these three weights would all be equal.
+	array1 = np.array([(0, 1, 2 ** 60 + 1), (1, 2, 2 ** 60), (0, 2, 2 ** 60)], dtype=np.int64)
+	graph3, skipped, duplicates = AdjacencyListGraph.from_edges(3, array1, False, True)
+	tree = parallel_boruvka(graph3, 1)
+	print("NumPy integer weights compared exactly:", not tree.has_edge(0, 1))
+
+	# A network with about 10^6 edges.
+	card_V = 250000
+	graph2 = generate_random_network(card_V, 3 * card_V, max_weight=100)
+	print(card_V, "stations,", graph2.get_card_E(), "edges,", os.cpu_count(), "CPU(s)")
+	for name, engine in [("boruvka", boruvka), ("kruskal_fast", kruskal_fast),
+						 ("parallel_boruvka", parallel_boruvka)]:
+		start = time.perf_counter()
+		tree = engine(graph2)
+		print(name + ":", get_total_weight(tree), "weight in", round(time.perf_counter() - start, 2), "s")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# parallel_sweep.py
+
+"""Run a single-source search from many sources across a pool of worker processes.
+
+The graph is frozen into a CSRGraph, whose arrays pickle compactly, and sent to
+each worker once when the pool starts.  After that only source numbers go out
+and (source, time, result) triples come back, so a benchmark sweep or an
+all-sources computation is spread over every core."""
+
+import os
+import time
+from multiprocessing import Pool
+from csr_graph import CSRGraph
+
+# Graph, search function, and keyword arguments installed in each worker by init_worker.
+worker_graph = None
+worker_search = None
+worker_kwargs = None
+worker_keep_results = True
+
+
+def parallel_sweep(G, search, sources, processes=None, keep_results=True, **kwargs):
+	"""Run search(G, s, **kwargs) for every source s, timing each run.
+
+	Arguments:
+	G -- the graph, an AdjacencyListGraph or CSRGraph.  An AdjacencyListGraph is
+	converted to a CSRGraph first, so the searches run on the CSR form.
+	search -- module-level search function, such as dijkstra or bfs, taking the
+	graph and a source.  It must be picklable, so not a lambda.
+	sources -- list of source vertices; repeats are allowed
+	processes -- number of worker processes, None for one per CPU.  With 1,
+	everything runs in this process.
+	keep_results -- if False, results are dropped in the workers and None is
+	returned in their place, which saves sending them back for timing-only sweeps
+	kwargs -- further keyword arguments for search, such as queue="lazy"
+
+	Returns:
+	A list with one (source, seconds, result) triple per source, in the order of
+	sources, where seconds is the time the search took in its worker.
+	"""
+	if not isinstance(G, CSRGraph):
+		G = CSRGraph.from_adjacency_list_graph(G)
+	if processes is None:
+		processes = os.cpu_count() or 1
+	processes = max(1, min(processes, len(sources)))
+	init_args = (G, search, kwargs, keep_results)
+
+	if processes == 1:
+		init_worker(*init_args)
+		return [run_source(s) for s in sources]
+
+	# Hand out sources in a few chunks per worker, to keep the pool busy without
+	# paying for a round trip per source.
+	chunksize = max(1, len(sources) // (4 * processes))
+	with Pool(processes, initializer=init_worker, initargs=init_args) as pool:
+		return pool.map(run_source, sources, chunksize)
+
+
+def init_worker(G, search, kwargs, keep_results):
+	"""Install the graph and search in this process."""
+	global worker_graph, worker_search, worker_kwargs, worker_keep_results
+	worker_graph = G
+	worker_search = search
+	worker_kwargs = kwargs
+	worker_keep_results = keep_results
+
+
+def run_source(s):
+	"""Run the installed search from s and return (s, seconds, result)."""
+	start = time.perf_counter()
+	result = worker_search(worker_graph, s, **worker_kwargs)
+	elapsed = time.perf_counter() - start
+	return s, elapsed, result if worker_keep_results else None
+
+
+# Testing
+if __name__ == "__main__":
+
+	from random import randrange, seed
+	from generate_random_graph import generate_random_network
+	from bfs import bfs
+	from dijkstra import dijkstra
+
+	seed(16)
+
+	card_V = 2000
+	graph1 = generate_random_network(card_V, 2 * card_V)
+	sources = [randrange(card_V) for _ in range(40)]
+
+	expected = [dijkstra(graph1, s, queue="lazy") for s in sources]
+	for processes in [1, 2, 4]:
+		start = time.perf_counter()
+		results = parallel_sweep(graph1, dijkstra, sources, processes, queue="lazy")
+		wall = time.perf_counter() - start
+		same = [s for s, seconds, result in results] == sources and \
+			[result[0] for s, seconds, result in results] == [d for d, pi in expected]
+		print(processes, "process(es): wall", round(wall, 3), "s, mean per search",
+			  round(sum(seconds for s, seconds, result in results) / len(results) * 1000, 3), "ms,",
+			  "distances " + ("agree" if same else "disagree"), "with sequential dijkstra")
+
+	results = parallel_sweep(graph1, bfs, sources, 2, keep_results=False)
+	print("Timing-only BFS sweep:", len(results), "searches, results kept:",
+		  any(result is not None for s, seconds, result in results))
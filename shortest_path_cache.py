@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# shortest_path_cache.py
+
+"""Least-recently-used cache of single-source shortest-path trees.
+
+A journey planner sees the same origins again and again, and every journey from
+an origin s can be answered from the d and pi that one search from s computes.
+The cache keeps (d, pi) for recently used sources within a byte budget, evicting
+the least recently used source when the budget is exceeded, and empties itself
+when the graph's version counter shows that an edge has been inserted or deleted."""
+
+import sys
+from collections import OrderedDict
+from dijkstra import dijkstra, path_to
+
+
+class ShortestPathCache:
+
+	def __init__(self, G, search=dijkstra, max_bytes=64 * 1024 * 1024):
+		"""Initialize an empty cache for graph G.
+
+		Arguments:
+		G -- the graph, which must have a get_version method
+		search -- function taking the graph and a source and returning (d, pi), such
+		as dijkstra or bfs.  Use a lambda to pass other arguments, for example
+		lambda G, s: dijkstra(G, s, queue="lazy").
+		max_bytes -- approximate limit on the memory held by cached results
+		"""
+		self.G = G
+		self.search = search
+		self.max_bytes = max_bytes
+		self.version = G.get_version()
+		self.trees = OrderedDict()  # source -> (d, pi, size), least recently used first
+		self.total_bytes = 0
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def get(self, s):
+		"""Return (d, pi) for source s, searching only if they are not cached.  The
+		lists are shared with the cache and must not be modified."""
+		if self.G.get_version() != self.version:
+			self.clear()
+			self.version = self.G.get_version()
+
+		if s in self.trees:
+			self.hits += 1
+			self.trees.move_to_end(s)
+			d, pi, size = self.trees[s]
+			return d, pi
+
+		self.misses += 1
+		d, pi = self.search(self.G, s)
+		size = result_bytes(d, pi)
+		if size <= self.max_bytes:  # a result bigger than the whole budget is not kept
+			self.trees[s] = (d, pi, size)
+			self.total_bytes += size
+			while self.total_bytes > self.max_bytes:
+				old_s, (old_d, old_pi, old_size) = self.trees.popitem(last=False)
+				self.total_bytes -= old_size
+				self.evictions += 1
+		return d, pi
+
+	def distance(self, s, t):
+		"""Return the weight of a shortest path from s to t, infinity if t is unreachable."""
+		d, pi = self.get(s)
+		return d[t]
+
+	def path(self, s, t):
+		"""Return the list of vertices on a shortest path from s to t, None if t is unreachable."""
+		d, pi = self.get(s)
+		return path_to(pi, s, t)
+
+	def clear(self):
+		"""Remove every cached result."""
+		self.trees.clear()
+		self.total_bytes = 0
+
+	def get_size(self):
+		"""Return the number of sources cached."""
+		return len(self.trees)
+
+	def get_bytes(self):
+		"""Return the approximate number of bytes held by cached results."""
+		return self.total_bytes
+
+	def get_stats(self):
+		"""Return a dictionary with the numbers of hits, misses, and evictions."""
+		return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+def result_bytes(d, pi):
+	"""Return the approximate number of bytes held by d and pi: the two lists plus the
+	distance objects.  Predecessors are vertex numbers shared with the rest of the
+	program and are not counted."""
+	return sys.getsizeof(d) + sys.getsizeof(pi) + sum(sys.getsizeof(x) for x in d)
+
+
+# Testing
+if __name__ == "__main__":
+
+	import time
+	from random import randrange, seed
+	from generate_random_graph import generate_random_network
+	from bfs import bfs
+
+	seed(12)
+
+	card_V = 5000
+	graph1 = generate_random_network(card_V, 2 * card_V, indexed=True)
+
+	# Journeys drawn from a small set of popular origins.
+	origins = [randrange(card_V) for _ in range(20)]
+	journeys = [(origins[randrange(len(origins))], randrange(card_V)) for _ in range(300)]
+
+	start = time.perf_counter()
+	expected = [dijkstra(graph1, s, queue="lazy")[0][t] for s, t in journeys]
+	uncached = time.perf_counter() - start
+
+	cache = ShortestPathCache(graph1, lambda G, s: dijkstra(G, s, queue="lazy"), max_bytes=8 * 1024 * 1024)
+	start = time.perf_counter()
+	results = [cache.distance(s, t) for s, t in journeys]
+	cached = time.perf_counter() - start
+	print("Uncached:", round(uncached, 3), "s, cached:", round(cached, 3), "s,", cache.get_stats(),
+		  cache.get_size(), "sources in", cache.get_bytes(), "bytes")
+	print("Cached distances " + ("agree" if results == expected else "disagree"))
+
+	# Deleting an edge on a cached tree must not leave stale distances behind.
+	s = origins[0]
+	t = max(range(card_V), key=lambda v: cache.distance(s, v))
+	path = cache.path(s, t)
+	graph1.delete_edge(path[-2], path[-1])
+	d, pi = dijkstra(graph1, s)
+	print("After deletion, distance " + ("agrees" if cache.distance(s, t) == d[t] else "disagrees")
+		  + " with a fresh search, cached sources:", cache.get_size())
+	graph1.insert_edge(path[-2], path[-1], 1)
+	d, pi = dijkstra(graph1, s)
+	print("After insertion, distance " + ("agrees" if cache.distance(s, t) == d[t] else "disagrees")
+		  + " with a fresh search")
+
+	# Breadth-first search trees can be cached the same way.
+	bfs_cache = ShortestPathCache(graph1, bfs)
+	print("BFS path from", s, "to", t, "has", len(bfs_cache.path(s, t)) - 1, "edges, distance",
+		  bfs_cache.distance(s, t))
@@ -7,14 +7,16 @@ import time
 
 # library import
 from adjacency_list_graph import AdjacencyListGraph
-from dijkstra import dijkstra
+from dijkstra import dijkstra, shortest_path
+from contraction_hierarchy import ContractionHierarchy
+from parallel_sweep import parallel_sweep
 
 # build a random connected undirected weighted graph
 def build_random_connected_graph(n, avg_degree=6, w_min=1, w_max=10, rng=None):
     if rng is None:
         rng = random.Random()
 
-    G = AdjacencyListGraph(n, directed=False, weighted=True)
+    G = AdjacencyListGraph(n, directed=False, weighted=True, indexed=True)
 
     # connect each new station to a random earlier one to keep the graph connected
     for i in range(1, n):
@@ -49,26 +51,17 @@ def pick_distinct_pair(n, rng):
         t += 1
     return s, t
 
-# turn predecessor list into an ordered path
-def reconstruct_path(pi, s, t):
-    path = []
-    cur = t
-    while cur is not None:
-        path.insert(0, cur)
-        if cur == s:
-            break
-        cur = pi[cur]
-    return path
-
 # main benchmarking function
-def benchmark_dijkstra(ns, trials_per_n=200, avg_degree=6, w_min=1, w_max=10, seed=42):
+# queue selects the priority queue used by dijkstra: "min_heap", "indexed" or "lazy"
+# processes > 1 fans the trials out over a process pool (on a CSR copy of each network)
+def benchmark_dijkstra(ns, trials_per_n=200, avg_degree=6, w_min=1, w_max=10, seed=42, queue="min_heap", processes=1):
     rng = random.Random(seed)
 
     print("=======================================================================")
     print("TASK 2b: Measuring Dijkstra's Performance on Random Tube Networks")
     print("=======================================================================")
     print("Average degree:", avg_degree, "| weight range:", w_min, "-", w_max,
-          "| trials per network:", trials_per_n, "| seed:", seed)
+          "| trials per network:", trials_per_n, "| seed:", seed, "| queue:", queue, "| processes:", processes)
     print("-----------------------------------------------------------------------")
     print("Columns: Stations, Edges, Average Time (ms)")
     print("-----------------------------------------------------------------------")
@@ -81,13 +74,19 @@ def benchmark_dijkstra(ns, trials_per_n=200, avg_degree=6, w_min=1, w_max=10, se
 
         # measure Dijkstra average time
         times = []
-        for _ in range(trials_per_n):
-            s, t = pick_distinct_pair(n, rng)
-            t_start = time.perf_counter()
-            d, pi = dijkstra(G, s)
-            t_end = time.perf_counter()
-            elapsed_ms = (t_end - t_start) * 1000.0
-            times.append(elapsed_ms)
+        if processes > 1:
+            sources = [pick_distinct_pair(n, rng)[0] for _ in range(trials_per_n)]
+            for s, seconds, result in parallel_sweep(G, dijkstra, sources, processes,
+                                                     keep_results=False, queue=queue):
+                times.append(seconds * 1000.0)
+        else:
+            for _ in range(trials_per_n):
+                s, t = pick_distinct_pair(n, rng)
+                t_start = time.perf_counter()
+                d, pi = dijkstra(G, s, queue=queue)
+                t_end = time.perf_counter()
+                elapsed_ms = (t_end - t_start) * 1000.0
+                times.append(elapsed_ms)
 
         avg_ms = sum(times) / float(len(times))
 
@@ -95,22 +94,68 @@ def benchmark_dijkstra(ns, trials_per_n=200, avg_degree=6, w_min=1, w_max=10, se
         print(str(n) + " , " + str(m) + " , " + str(round(avg_ms, 3)))
 
 
+# compare contraction hierarchy queries with early-exit Dijkstra on the same networks
+# core_degree leaves the dense middle of these random networks uncontracted (see ContractionHierarchy)
+def benchmark_contraction_hierarchy(ns, queries_per_n=200, avg_degree=6, w_min=1, w_max=10, seed=42, core_degree=8):
+    rng = random.Random(seed)
+
+    print("=======================================================================")
+    print("TASK 2b: Contraction Hierarchy vs Dijkstra on Random Tube Networks")
+    print("=======================================================================")
+    print("Average degree:", avg_degree, "| weight range:", w_min, "-", w_max,
+          "| queries per network:", queries_per_n, "| seed:", seed, "| core degree:", core_degree)
+    print("-----------------------------------------------------------------------")
+    print("Columns: Stations, Edges, Preprocessing (s), Shortcuts, Core, CH Query (ms), Dijkstra Query (ms)")
+    print("-----------------------------------------------------------------------")
+
+    for n in ns:
+        G = build_random_connected_graph(n, avg_degree=avg_degree,
+                                         w_min=w_min, w_max=w_max, rng=rng)
+        m = G.get_card_E()
+
+        t_start = time.perf_counter()
+        ch = ContractionHierarchy(G, core_degree=core_degree)
+        preprocessing_s = time.perf_counter() - t_start
+
+        pairs = [pick_distinct_pair(n, rng) for _ in range(queries_per_n)]
+        t_start = time.perf_counter()
+        ch_results = [ch.query(s, t)[0] for s, t in pairs]
+        ch_ms = (time.perf_counter() - t_start) * 1000.0 / queries_per_n
+        t_start = time.perf_counter()
+        dijkstra_results = [shortest_path(G, s, t)[0] for s, t in pairs]
+        dijkstra_ms = (time.perf_counter() - t_start) * 1000.0 / queries_per_n
+
+        if ch_results != dijkstra_results:
+            print("Distance mismatch between contraction hierarchy and Dijkstra for", n, "stations")
+        print(str(n) + " , " + str(m) + " , " + str(round(preprocessing_s, 3)) + " , "
+              + str(ch.get_shortcut_count()) + " , " + str(ch.get_core_size()) + " , "
+              + str(round(ch_ms, 3)) + " , " + str(round(dijkstra_ms, 3)))
+
+
 # test with different amount of stations
 if __name__ == "__main__":
     sizes = [100, 200, 300, 400, 500, 600, 700, 800, 900, 1000]
 
-    benchmark_dijkstra(
-        ns=sizes,
-        trials_per_n=200,
-        avg_degree=6,
-        w_min=1,
-        w_max=10,
-        seed=42
-    )
+    # same seed, so both priority queues see the same networks and sources
+    for queue in ["min_heap", "indexed"]:
+        benchmark_dijkstra(
+            ns=sizes,
+            trials_per_n=200,
+            avg_degree=6,
+            w_min=1,
+            w_max=10,
+            seed=42,
+            queue=queue
+        )
+
+    # the contraction hierarchy benchmark takes several seconds and these random
+    # networks have little hierarchy for it to use, so it runs only on request
+    if "--ch" in sys.argv:
+        benchmark_contraction_hierarchy(ns=[1000, 2000, 5000], queries_per_n=200)
 
 #part 2b:London underground data import
 from adjacency_list_graph import AdjacencyListGraph
-from dijkstra import dijkstra
+from contraction_hierarchy import ContractionHierarchy
 
 #required import library to open excel file
 from openpyxl import load_workbook
@@ -121,7 +166,6 @@ def load_edges_from_excel(file_path):
     ws = wb.active  # first sheet
     edges = []
     skipped = 0
-    dupes = 0
 
     first_row = True
     for row in ws.iter_rows(values_only=True):
@@ -162,29 +206,15 @@ def load_edges_from_excel(file_path):
     id_by_name = {name.upper(): i for i, name in enumerate(stations)}
     name_by_id = {i: name for i, name in enumerate(stations)}
 
-    G = AdjacencyListGraph(len(stations), directed=False, weighted=True)
-
-    for u_name, v_name, w in edges:
-        u = id_by_name[u_name.upper()]
-        v = id_by_name[v_name.upper()]
-        if not G.has_edge(u, v):
-            G.insert_edge(u, v, w)
-        else:
-            dupes += 1
+    # bulk load: duplicate connections are dropped (first one wins) and counted
+    G, bad, dupes = AdjacencyListGraph.from_edges(
+        len(stations),
+        ((id_by_name[u_name.upper()], id_by_name[v_name.upper()], w) for u_name, v_name, w in edges),
+        directed=False, weighted=True, indexed=True)
+    skipped += bad
 
     return G, id_by_name, name_by_id, skipped, dupes
 
-#rebuild path from Dijkstra’s output
-def reconstruct_path(pi, s, t):
-    path = []
-    cur = t
-    while cur is not None:
-        path.insert(0, cur)
-        if cur == s:
-            break
-        cur = pi[cur]
-    return path
-
 # locate the excel file:
 file_path = 'London Underground data.xlsx'
 
@@ -196,6 +226,9 @@ def main():
 
     print("Stations:", G.get_card_V(), " | Connections:", G.get_card_E())
     print("Skipped rows:", skipped, " | Duplicates ignored:", dupes)
+
+    # preprocess the network once so that every lookup below is fast
+    ch = ContractionHierarchy(G)
     print("")
     print("Type two station names to find the fastest route (blank to quit).")
 
@@ -221,18 +254,15 @@ def main():
         s = id_by_name[s_key]
         t = id_by_name[t_key]
 
-        # Run Dijkstra’s algorithm to find shortest travel times
-        d, pi = dijkstra(G, s)
-
-        # Reconstruct route from station IDs
-        path_ids = reconstruct_path(pi, s, t)
+        # Query the contraction hierarchy (same distances as Dijkstra’s algorithm)
+        dist, path_ids = ch.query(s, t)
 
-        if len(path_ids) == 0 or d[t] == float('inf'):
+        if path_ids is None:
             print("No path found.")
         else:
             path_names = [name_by_id[i] for i in path_ids]
             print("Route:", " -> ".join(path_names))
-            print("Total time:", str(d[t]), "minutes")
+            print("Total time:", str(dist), "minutes")
         print("")
 
 if __name__ == "__main__":
@@ -8,19 +8,15 @@ def create_graph_from_dict(graph_dict):
     stations = sorted(set(graph_dict.keys()).union(*[set(connections) for connections in graph_dict.values()]))
     station_to_id = {station: i for i, station in enumerate(stations)}
     
-    #create undirected graph 
-    graph = AdjacencyListGraph(len(stations), directed=False, weighted=False)
-    
-    #add all connections to the graph
-    for station, connections in graph_dict.items():
-        for connected_station in connections:
-            # only add each connection once to avoid duplicates
-            if station_to_id[station] < station_to_id[connected_station]:
-                try:
-                    graph.insert_edge(station_to_id[station], station_to_id[connected_station])
-                except RuntimeError:
-                    # connection already exists, skip it
-                    pass
+    #create undirected graph with all connections in one pass
+    #connections listed from both ends or more than once are dropped by the bulk loader
+    graph, _skipped, _dupes = AdjacencyListGraph.from_edges(
+        len(stations),
+        ((station_to_id[station], station_to_id[connected_station])
+         for station, connections in graph_dict.items()
+         for connected_station in connections
+         if station_to_id[station] < station_to_id[connected_station]),
+        directed=False, weighted=False)
     return graph, stations, station_to_id
 
 def display_all_possible_routes(graph, stations):
@@ -3,6 +3,9 @@ import time
 import pandas as pd
 from adjacency_list_graph import AdjacencyListGraph
 from bfs import bfs
+from parallel_sweep import parallel_sweep
+from csr_graph import CSRGraph
+from vectorized_bfs import bfs_vectorized
 from print_path import print_path
 import matplotlib.pyplot as plt
 
@@ -19,9 +22,14 @@ def gen_random_g(n: int, edge_probability: float = 0.05) -> AdjacencyListGraph:
     return G
 
 #Measuring of the average running time of BFS on graph G. Function must return the average time over all trials:
-def av_bfs_time(G: AdjacencyListGraph, trials: int = 50) -> float:
+#with processes > 1 the trials run in a process pool on a CSR copy of G
+def av_bfs_time(G: AdjacencyListGraph, trials: int = 50, processes: int = 1) -> float:
     n = G.get_card_V()
     total = 0.0
+    if processes > 1:
+        sources = [random.randrange(n) for _ in range(trials)]
+        results = parallel_sweep(G, bfs, sources, processes, keep_results=False)
+        return sum(seconds for _src, seconds, _result in results) / trials
     for _ in range(trials):
         src = random.randrange(n)     #pick a random source vertex
         t0 = time.time()     #measure the time to run BFS
@@ -32,15 +40,54 @@ def av_bfs_time(G: AdjacencyListGraph, trials: int = 50) -> float:
 #generate a randon graph with the edge probability, measure the average BFS running time
 def empirical_performance(sizes = tuple(range(100, 1001, 100)),
                           edge_probability: float =0.05,
-                          trials: int = 50):
+                          trials: int = 50,
+                          processes: int = 1):
     results =[]
     for n in sizes:
         G = gen_random_g(n, edge_probability=edge_probability) #generate a random graph
-        avt_t = av_bfs_time(G, trials=trials) #measure the average BFS running time
+        avt_t = av_bfs_time(G, trials=trials, processes=processes) #measure the average BFS running time
         print(f"n={n}, average BFS time={avt_t:.6f} sec")
         results.append((n, avt_t)) #store the pair (size, time)
     return results
 
+#Generate a sparse random undirected graph in CSR form in linear time (a random spanning tree plus extra random edges),
+#for sizes where checking all n^2 pairs as gen_random_g does is too slow
+def gen_sparse_random_g(n: int, avg_degree: int = 4) -> CSRGraph:
+    edges = [(random.randrange(v), v) for v in range(1, n)]
+    seen = set(edges)  # CSRGraph rejects parallel edges, so keep each pair once
+    for _ in range(n * avg_degree // 2 - (n - 1)):
+        u, v = random.randrange(n), random.randrange(n)
+        if u != v and (min(u, v), max(u, v)) not in seen:
+            seen.add((min(u, v), max(u, v)))
+            edges.append((u, v))
+    return CSRGraph.from_edges(n, edges, directed=False)
+
+#Compare bfs with the vectorized frontier-at-a-time BFS, on the 100-1000 sweep and on sparse graphs up to 10^6 vertices
+def compare_vectorized_bfs(sizes=tuple(range(100, 1001, 100)),
+                           large_sizes=(10**4, 10**5, 10**6),
+                           edge_probability: float = 0.05,
+                           trials: int = 5):
+    print("n, bfs time (sec), vectorized BFS time (sec)")
+    for n in list(sizes) + list(large_sizes):
+        if n in sizes:
+            G = gen_random_g(n, edge_probability=edge_probability)
+            G_csr = CSRGraph.from_adjacency_list_graph(G) #convert once, outside the timing
+        else:
+            G = G_csr = gen_sparse_random_g(n)
+        bfs_total = 0.0
+        vectorized_total = 0.0
+        for _ in range(trials):
+            src = random.randrange(n)
+            t0 = time.perf_counter()
+            dist, _pred = bfs(G, src)
+            bfs_total += time.perf_counter() - t0
+            t0 = time.perf_counter()
+            vec_dist, _vec_pred = bfs_vectorized(G_csr, src, as_lists=False)
+            vectorized_total += time.perf_counter() - t0
+            if [d if d != float('inf') else -1 for d in dist] != vec_dist.tolist():
+                print("distance mismatch for n =", n, "source", src)
+        print(f"{n}, {bfs_total / trials:.6f}, {vectorized_total / trials:.6f}")
+
 #Construct a graph with London underground loaded data
 def load_London_underground(file_path: str):
     df = pd.read_excel(file_path, header=None) #read the Excel file using Pandas
@@ -55,19 +102,14 @@ def load_London_underground(file_path: str):
     station2id = {name: i for i, name in enumerate(stations)} #create dictionary
     id2station = stations #dictionary for reverse
 
-    G = AdjacencyListGraph(len(stations))
-    seen = set() #track inserted edges
-    for _, row in df.iterrows(): #go over each row of the DataFrame
-        u = station2id[row['Station']]
-        v = station2id[row['Next_station']]
-        if u == v:
-            continue #skip self-loops
-        a, b = (u, v) if u < v else (v, u) #normalize a, b to have always a<b
-        if (a, b) in seen:
-            continue
-        seen.add((a, b))
-        G.insert_edge(a, b)
-        G.insert_edge(b, a) #insert edge by adding both directions
+    #map station names to ids for all rows at once and skip self-loops
+    us = df['Station'].map(station2id)
+    vs = df['Next_station'].map(station2id)
+    keep = us != vs
+    pairs = [(min(u, v), max(u, v)) for u, v in zip(us[keep], vs[keep])] #normalize to have always a<b
+    #insert each edge in both directions, duplicates are dropped by the bulk loader
+    G, _skipped, _dupes = AdjacencyListGraph.from_edges(
+        len(stations), (edge for a, b in pairs for edge in ((a, b), (b, a))))
 
     return G, station2id, id2station
 
@@ -92,6 +134,8 @@ if __name__ == "__main__":
     print("Empirical Performance Measurement:")
     #Call the empirical_performance function to measure the execution time of BFS
     results = empirical_performance(sizes=range(100, 1001,100), edge_probability=0.05, trials=50)
+    print("\nVectorized BFS Comparison:")
+    compare_vectorized_bfs()
     print("\nLondon Underground Shortest Paths:")
     excel_path = 'London Underground data.xlsx'
     G_LU, station2id, id2station = load_London_underground(excel_path)
@@ -1,6 +1,7 @@
 #task 4b
 #Aidanas Alyta
 
+import os
 import random
 import time
 import pandas as pd
@@ -8,14 +9,17 @@ import matplotlib.pyplot as plt
 
 #import required libraries
 from adjacency_list_graph import AdjacencyListGraph
-from mst import kruskal, get_total_weight
-#dijkstra will be used for impact analysis for comparing task2b long journey (Uxbridge to Upminster)
-from dijkstra import dijkstra
+from mst import kruskal, prim, get_total_weight, minimum_spanning_tree
+#all-pairs distance matrices will be used for impact analysis for comparing task2b long journey (Uxbridge to Upminster)
+from distance_matrix import DistanceMatrix
+from closure_impact import closure_impacts, write_impacts_csv
+from biconnected_components import biconnected_components
+from dynamic_mst import DynamicMST
 
 #Data generation
 def build_random_connected_graph(num_stations, extra_edge_probability=0.02):
 
-    G = AdjacencyListGraph(num_stations, directed=False, weighted=True)
+    G = AdjacencyListGraph(num_stations, directed=False, weighted=True, indexed=True)
     #linking each new station to a previous one
     for v in range(1, num_stations):
         u = random.randint(0, v - 1)     # connect v to some earlier station
@@ -32,17 +36,34 @@ def build_random_connected_graph(num_stations, extra_edge_probability=0.02):
 
     return G
 
+#linear-time version for large sweeps: instead of trying every pair of stations,
+#add about extra_edges_per_station random extra edges per station
+def build_sparse_random_connected_graph(num_stations, extra_edges_per_station=1):
+
+    edges = [(random.randint(0, v - 1), v, random.randint(1, 10)) for v in range(1, num_stations)]
+    for _ in range(num_stations * extra_edges_per_station):
+        u = random.randrange(num_stations)
+        v = random.randrange(num_stations)
+        if u != v:
+            edges.append((u, v, random.randint(1, 10)))
+    G, _skipped, _duplicates = AdjacencyListGraph.from_edges(num_stations, edges,
+                                                             directed=False, weighted=True, indexed=True)
+    return G
+
 #measuring average compute time function
-def measure_average_backbone_time(num_stations, trials=10):
+def measure_average_backbone_time(num_stations, trials=10, mode="textbook", sparse=False):
 
     total_time = 0.0
     valid_trials = 0
 
     for _ in range(trials):
 
-        G = build_random_connected_graph(num_stations)
+        if sparse:
+            G = build_sparse_random_connected_graph(num_stations)
+        else:
+            G = build_random_connected_graph(num_stations)
         start = time.perf_counter()
-        _ = kruskal(G)   # compute the core backbone
+        _ = kruskal(G, mode=mode)   # compute the core backbone
         end = time.perf_counter()
 
         total_time += (end - start)
@@ -79,6 +100,54 @@ def run_empirical_measurement():
     plt.grid(True)
     # plt.show()
 
+    #textbook Kruskal vs the fast mode (sorted weight arrays, array union-find) up to 10^5 stations
+    print("=== Task 4b: Kruskal textbook vs fast mode on sparse networks ===")
+    print("Stations | textbook ms | fast ms")
+    for n in [1000, 10000, 100000]:
+        trials = 10 if n < 100000 else 3
+        textbook_ms = round(measure_average_backbone_time(n, trials, "textbook", sparse=True) * 1000, 3)
+        fast_ms = round(measure_average_backbone_time(n, trials, "fast", sparse=True) * 1000, 3)
+        print(str(n) + "\t\t" + str(textbook_ms) + "\t\t" + str(fast_ms))
+
+#compare Prim's algorithm with the general heap queue and the indexed integer heap
+def compare_prim_queues(trials=10):
+
+    print("=== Task 4b: Prim priority queue comparison ===")
+    print("Stations | min_heap ms | indexed ms")
+
+    for n in range(100, 1100, 100):  # 100, 200, ..., 1000
+        totals = {"min_heap": 0.0, "indexed": 0.0}
+        for _ in range(trials):
+            G = build_random_connected_graph(n)
+            for queue in totals:
+                start = time.perf_counter()
+                _ = prim(G, 0, queue=queue)
+                totals[queue] += time.perf_counter() - start
+        print(str(n) + "\t\t" + str(round(totals["min_heap"] / trials * 1000, 3))
+              + "\t\t" + str(round(totals["indexed"] / trials * 1000, 3)))
+
+def compare_mst_engines(n=800, probabilities=(0.01, 0.05, 0.1, 0.2, 0.5), trials=3):
+    # time every minimum spanning tree engine as the network gets denser, and check
+    # that they all agree on the total backbone weight
+    engines = ["kruskal", "kruskal_fast", "filter_kruskal", "boruvka", "prim", "prim_indexed"]
+    print("=== Task 4b: MST engines on " + str(n) + " stations as extra edges are added ===")
+    print("Extra edge probability | " + " | ".join(engine + " ms" for engine in engines) + " | weights agree")
+
+    for p in probabilities:
+        totals = {engine: 0.0 for engine in engines}
+        agree = True
+        for _ in range(trials):
+            G = build_random_connected_graph(n, p)
+            weights = set()
+            for engine in engines:
+                start = time.perf_counter()
+                mst = minimum_spanning_tree(G, engine)
+                totals[engine] += time.perf_counter() - start
+                weights.add(get_total_weight(mst))
+            agree = agree and len(weights) == 1
+        print(str(p) + "\t\t" + "\t".join(str(round(totals[engine] / trials * 1000, 3)) for engine in engines)
+              + "\t" + str(agree))
+
     #Part 2
 def collect_undirected_edges(G):
     # turn an undirected graph into a list of edges (u, v, w), with u < v so each edge appears only once.
@@ -101,20 +170,6 @@ def print_edges(title, edges, name_by_id):
         print("  " + name_by_id[u] + " - " + name_by_id[v] + "  (weight = " + str(w) + ")")
 
 
-# path reconstruction helper for impact analysis
-def reconstruct_path(predecessors, s, t):
-    # rebuild path from s to t using predecessor list
-    path = []
-    cur = t
-    while cur is not None:
-        path.insert(0, cur)
-        if cur == s:
-            break
-        cur = predecessors[cur]
-    if len(path) == 0 or path[0] != s:
-        return []
-    return path
-
 def load_underground_excel (path):#load the spreadsheet and extract the data from it
     df = pd.read_excel(path)
 
@@ -131,14 +186,11 @@ def load_underground_excel (path):#load the spreadsheet and extract the data fro
     id_by_name = {name.upper(): i for i, name in enumerate(stations)} #add id to stations
     name_by_id = {i: name for i, name in enumerate(stations)}
 
-    G = AdjacencyListGraph(len(stations), directed=False, weighted=True) #build the graph object using the data from spreadsheet
-
-    for (u_name, v_name, w) in edges: #add edges to the graph
-        u = id_by_name[u_name.upper()]
-        v = id_by_name [v_name.upper()]
-
-        if not G.has_edge(u, v):
-            G.insert_edge(u, v, w)
+    #build the graph object using the data from spreadsheet in one pass, first duplicate connection wins
+    G, _skipped, _dupes = AdjacencyListGraph.from_edges(
+        len(stations),
+        ((id_by_name[u_name.upper()], id_by_name[v_name.upper()], w) for (u_name, v_name, w) in edges),
+        directed=False, weighted=True, indexed=True)
 
     return G, id_by_name, name_by_id
 
@@ -184,6 +236,48 @@ def run_london_application():
     print("Displaying", r, "out of", len(redundant_edges), "redundant connections")
     print_edges("These connections can be closed without disrupting the network:", to_show, name_by_id)
 
+    # Closure impact of every redundant connection over all journeys, ranked into a CSV
+    impacts = closure_impacts(G, redundant_pairs)
+    write_impacts_csv('closure_impacts.csv', impacts, name_by_id)
+    print("\nClosure impact over all journeys (full ranking in closure_impacts.csv)")
+    for impact in impacts[:5]:
+        print("  " + name_by_id[impact.u] + " - " + name_by_id[impact.v] + ": " + str(impact.affected)
+              + " journeys longer, total increase = " + str(impact.increase) + " minutes")
+
+    # Single points of failure: connections (bridges) and stations (articulation points)
+    # whose closure alone splits the network, from one linear-time search
+    bridges, articulation_points, components = biconnected_components(G)
+    bridge_edges = [(u, v, G.find_edge(u, v).get_weight()) for (u, v) in bridges]
+    print("\nSingle points of failure")
+    print("Biconnected components: " + str(len(components)))
+    print_edges("Connections whose closure disconnects the network (" + str(len(bridges)) + "):",
+                bridge_edges[:r], name_by_id)
+    print("Stations whose closure disconnects the network (" + str(len(articulation_points)) + "):")
+    print("  " + ", ".join(name_by_id[v] for v in articulation_points[:r]))
+
+    # Rolling what-if closures of each backbone connection: the dynamic backbone finds
+    # the replacement connection, then reopening the closed one restores the weight
+    dynamic_backbone = DynamicMST(G, mst_graph)
+    replacements = []
+    unreplaceable = 0
+    for (u, v, w) in mst_edges:
+        if not dynamic_backbone.in_tree(u, v):
+            continue  # an equal-weight connection took its place after an earlier closure
+        added, removed = dynamic_backbone.delete_edge(u, v)
+        if len(added) > 0:
+            replacements.append((added[0][2] - w, u, v, added[0]))
+        else:
+            unreplaceable += 1
+        dynamic_backbone.insert_edge(u, v, w)
+    replacements.sort(key=lambda replacement: -replacement[0])
+    print("\nBackbone closures")
+    print("Backbone connections with a replacement: " + str(len(replacements)))
+    print("Backbone connections without one (bridges): " + str(unreplaceable))
+    print("Backbone total weight after reopening: " + str(dynamic_backbone.get_total_weight()))
+    for (increase, u, v, (x, y, w)) in replacements[:5]:
+        print("  closing " + name_by_id[u] + " - " + name_by_id[v] + " brings in " + name_by_id[x] + " - "
+              + name_by_id[y] + " (backbone weight +" + str(increase) + ")")
+
     # 3) Impact analysis: compare full network vs backbone-only network
     print("\nImpact analysis on backbone-only network")
 
@@ -209,35 +303,40 @@ def run_london_application():
     s = id_by_name[src_key]
     t = id_by_name[dst_key]
 
+    # All-pairs distances for both networks, built on the first run and memory-mapped after.
+    # The files are kept next to the spreadsheet, not in the directory the script runs from,
+    # and are rebuilt whenever the network read from the spreadsheet changes.
+    data_dir = os.path.dirname(os.path.abspath(excel_path))
+    full_matrix = DistanceMatrix.cached(G, os.path.join(data_dir, 'london_full'))
+    mst_matrix = DistanceMatrix.cached(mst_graph, os.path.join(data_dir, 'london_backbone'))
+
     # Shortest path on FULL network
-    dist_full, pi_full = dijkstra(G, s)
-    path_full_ids = reconstruct_path(pi_full, s, t)
+    dist_full, path_full_ids = full_matrix.distance(s, t), full_matrix.path(s, t)
 
     print("\nOriginal journey result on full network:")
-    if len(path_full_ids) == 0 or dist_full[t] == float('inf'):
+    if path_full_ids is None:
         print("No path found in full network.")
     else:
         route_full_names = [name_by_id[vid] for vid in path_full_ids]
         print("Route on full network:")
         print("  " + " -> ".join(route_full_names))
-        print("Total journey time on full network: " + str(dist_full[t]) + " minutes")
+        print("Total journey time on full network: " + str(dist_full) + " minutes")
 
     # Shortest path on BACKBONE-ONLY network
-    dist_mst, pi_mst = dijkstra(mst_graph, s)
-    path_mst_ids = reconstruct_path(pi_mst, s, t)
+    dist_mst, path_mst_ids = mst_matrix.distance(s, t), mst_matrix.path(s, t)
 
     print("\nBackbone-only journey result:")
-    if len(path_mst_ids) == 0 or dist_mst[t] == float('inf'):
+    if path_mst_ids is None:
         print("No path found in backbone-only network.")
     else:
         route_mst_names = [name_by_id[vid] for vid in path_mst_ids]
         print("Route on backbone:")
         print("  " + " -> ".join(route_mst_names))
-        print("Total journey time on backbone: " + str(dist_mst[t]) + " minutes")
+        print("Total journey time on backbone: " + str(dist_mst) + " minutes")
 
     # time difference
-    if len(path_full_ids) != 0 and dist_full[t] != float('inf') and len(path_mst_ids) != 0 and dist_mst[t] != float('inf'):
-        diff = dist_mst[t] - dist_full[t]
+    if path_full_ids is not None and path_mst_ids is not None:
+        diff = dist_mst - dist_full
         print("\nDifference in journey time (backbone - full): " + str(diff) + " minutes")
         print("Use this in the report to discuss how redundant connections affect efficiency/resilience.")
 
@@ -246,6 +345,8 @@ def run_london_application():
 def main():
     # Part 1: empirical performance
     run_empirical_measurement()
+    compare_prim_queues()
+    compare_mst_engines()
 
     # Part 2: real London Underground data application
     run_london_application()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# vectorized_bfs.py
+
+"""Level-synchronous breadth-first search with NumPy.
+
+Each level handles the whole frontier at once: the CSR offsets give, for every
+frontier vertex, the slice of the targets array holding its neighbors, and one
+gather collects all those neighbors with their parents.  A mask keeps the
+neighbors not yet discovered, the first occurrence of each is kept, and one
+scatter writes their distances and predecessors.  The Python interpreter runs
+a few NumPy calls per level instead of several statements per edge."""
+
+import numpy as np
+from csr_graph import CSRGraph
+
+
+def csr_arrays(G):
+	"""Return the offsets and targets of G as NumPy arrays sharing the CSRGraph's
+	memory, converting an AdjacencyListGraph to a CSRGraph first."""
+	if not isinstance(G, CSRGraph):
+		G = CSRGraph.from_adjacency_list_graph(G)
+	offsets = np.frombuffer(G.offsets, dtype=np.int64)
+	targets = np.frombuffer(G.targets, dtype=np.int32)
+	return offsets, targets
+
+
+def bfs_vectorized(G, source, as_lists=True):
+	"""Perform breadth-first search a frontier at a time.  Vertices are discovered in
+	the same order as bfs discovers them, so distances and predecessors are the same.
+
+	Arguments:
+	G -- the graph, a CSRGraph or an AdjacencyListGraph (converted once; to search
+	the same graph repeatedly, convert it with CSRGraph.from_adjacency_list_graph first)
+	source -- index of the source vertex
+	as_lists -- if True, return lists as bfs does, with infinity and None for
+	unreachable vertices.  If False, return NumPy integer arrays with -1 for
+	unreachable vertices, which avoids converting a million-entry result.
+
+	Returns:
+	dist -- distances from the source
+	pi -- predecessors
+	"""
+	offsets, targets = csr_arrays(G)
+	card_V = len(offsets) - 1
+	dist = np.full(card_V, -1, dtype=np.int64)
+	pi = np.full(card_V, -1, dtype=np.int64)
+	dist[source] = 0
+
+	frontier = np.array([source], dtype=np.int64)
+	level = 0
+	while frontier.size > 0:
+		# Gather: positions in targets of every edge leaving the frontier, in frontier order.
+		starts = offsets[frontier]
+		counts = offsets[frontier + 1] - starts
+		total = int(counts.sum())
+		if total == 0:
+			break
+		row_begin = np.cumsum(counts) - counts  # where each vertex's edges begin in the gathered array
+		positions = np.arange(total) - np.repeat(row_begin - starts, counts)
+		parents = np.repeat(frontier, counts)
+		neighbors = targets[positions]
+
+		# Mask: keep neighbors not yet discovered, then the first edge reaching each one.
+		undiscovered = dist[neighbors] < 0
+		neighbors = neighbors[undiscovered]
+		parents = parents[undiscovered]
+		new_vertices, first = np.unique(neighbors, return_index=True)
+		first.sort()  # back into discovery order, which is the order a FIFO queue would give
+
+		# Scatter: the new vertices form the next frontier.
+		frontier = neighbors[first].astype(np.int64)
+		level += 1
+		dist[frontier] = level
+		pi[frontier] = parents[first]
+
+	if not as_lists:
+		return dist, pi
+	inf = float('inf')
+	return [inf if x < 0 else x for x in dist.tolist()], [None if x < 0 else x for x in pi.tolist()]
+
+
+# Testing
+if __name__ == "__main__":
+
+	import time
+	from random import randrange, seed
+	from bfs import bfs
+	from generate_random_graph import generate_random_graph
+
+	seed(18)
+
+	# Same distances and predecessors as bfs, directed and undirected.
+	all_equal = True
+	for directed in [True, False]:
+		for trial in range(20):
+			graph1 = generate_random_graph(200, 0.02, True, directed)
+			s = randrange(200)
+			if bfs_vectorized(graph1, s) != bfs(graph1, s):
+				print("Mismatch for source", s, "directed" if directed else "undirected")
+				all_equal = False
+	print("Vectorized BFS results are " + ("not " if not all_equal else "") + "equal to bfs")
+
+	# Sparse random graphs, converted to CSR once.
+	print("Vertices, Edges, bfs (s), vectorized (s)")
+	for card_V in [10000, 100000, 1000000]:
+		edges = [(randrange(v), v) for v in range(1, card_V)]  # spanning tree, so every vertex is reached
+		edges += [(randrange(card_V), randrange(card_V)) for _ in range(card_V)]
+		edges = {(min(u, v), max(u, v)): None for (u, v) in edges if u != v}  # no parallel edges
+		graph2 = CSRGraph.from_edges(card_V, list(edges), False)
+		start = time.perf_counter()
+		dist, pi = bfs(graph2, 0)
+		plain = time.perf_counter() - start
+		start = time.perf_counter()
+		fast_dist, fast_pi = bfs_vectorized(graph2, 0, as_lists=False)
+		fast = time.perf_counter() - start
+		if fast_dist.tolist() != dist:
+			print("Mismatch on", card_V, "vertices")
+		print(card_V, graph2.get_card_E(), round(plain, 3), round(fast, 3), sep=", ")